@@ -14,10 +14,8 @@ yeast = reg_bench.ode.yeast_glycolysis()
 dy = yeast()
 
 
-for i in range(3):
-    y0 = yeast.initial_conditions(noise=True)
-    t = np.linspace(0, 5, 5 * 10 ** 5)
-
+t = np.linspace(0, 5, 5 * 10 ** 5)
+for y0 in yeast.initial_conditions(noise=True, rng=0, n=3):
     s = odeint(dy, y0, t)
     for j in range(3):
         plt.figure(j)
@@ -0,0 +1,264 @@
+"""Performance benchmarks of all problem families.
+
+Every benchmark records the best wall time out of `repeat` runs and the peak memory allocated
+during one extra run traced with `tracemalloc`. Results are written as JSON and can be compared
+against a stored baseline::
+
+    python -m reg_bench.benchmark --output results.json --baseline benchmarks/baseline.json
+
+The comparison exits with status 1 if any benchmark got slower or allocates more memory than
+the baseline by more than the given tolerance.
+"""
+import argparse
+import fnmatch
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from . import cache
+from .__version__ import __version__
+
+
+map_steps = 10 ** 4
+rhs_evaluations = 10 ** 4
+sr_scaled_points = 10 ** 6
+sr_elementwise_points = 2000
+ensemble_size = 16
+# time differences below this many seconds are within the noise of the timer and never flagged
+min_time_difference = 1e-3
+
+# numpy is imported before, time and memory are measured in separate runs as tracing slows imports down
+_import_script = """
+import sys, time, tracemalloc
+import numpy
+trace = sys.argv[1] == "memory"
+if trace:
+    tracemalloc.start()
+t = time.perf_counter()
+import reg_bench, reg_bench.ode, reg_bench.maps, reg_bench.symbolic_regression
+print(tracemalloc.get_traced_memory()[1] if trace else time.perf_counter() - t)
+"""
+
+
+def measure(func, repeat=3):
+    """Best wall time in seconds of `repeat` calls of `func` and peak memory of one traced call in bytes."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return dict(time=min(times), memory=memory)
+
+
+def measure_import(repeat=3):
+    """Time and memory of importing all subpackages in a fresh interpreter."""
+    run = lambda metric: float(subprocess.check_output([sys.executable, "-c", _import_script, metric]))
+    return dict(time=min(run("time") for _ in range(repeat)), memory=int(run("memory")))
+
+
+def benchmarks():
+    """All benchmarks as (name, zero argument callable) pairs, except the import benchmark."""
+    return [*_ode_benchmarks(), *_map_benchmarks(), *_jit_benchmarks(), *_sr_benchmarks()]
+
+
+def _ode_benchmarks():
+    from .ode import all_loaders
+    from .ode import generate_ode_data
+    from .ode import generate_ode_ensemble
+    from .ode import lorenz
+    from .ode import yeast_glycolysis
+    from .ode.integrate import add_measurement_noise
+    from .ode.integrate import estimate_derivative
+    from .ode.integrate import integrate_ode
+
+    for name, loader in all_loaders.items():
+        yield "ode.load_{}".format(name), loader
+
+    t, x0 = np.linspace(0, 100, 10001), np.ones(3)
+    x = integrate_ode(lorenz, x0, t)
+    noisy = add_measurement_noise(x, 0.01, rng=0)
+    yield "ode.generate_ode_data.integrate", lambda: integrate_ode(lorenz, x0, t)
+    yield "ode.generate_ode_data.noise", lambda: add_measurement_noise(x, 0.01, rng=0)
+    yield "ode.generate_ode_data.differentiate", lambda: estimate_derivative(t, noisy)
+
+    # ensembles against a loop over single runs, yeast_glycolysis needs very different step sizes
+    yeast, t_ensemble = yeast_glycolysis(), np.linspace(0, 10, 1001)
+    for name, problem, initial in (
+        ("lorenz", lorenz, np.random.default_rng(0).uniform(-10, 10, (ensemble_size, 3))),
+        ("yeast_glycolysis", yeast, yeast.initial_conditions(n=ensemble_size, rng=0)),
+    ):
+        yield "ode.generate_ode_ensemble.{}".format(name), lambda problem=problem, initial=initial: (
+            generate_ode_ensemble(problem, initial, t_ensemble)
+        )
+        yield "ode.generate_ode_ensemble.{}.loop".format(name), lambda problem=problem, initial=initial: [
+            generate_ode_data(problem, x0_, t_ensemble) for x0_ in initial
+        ]
+
+
+def _map_benchmarks():
+    from .maps import all_maps
+    from .maps import generate_map_data
+
+    for problem, meta in all_maps.items():
+        x0 = np.full(meta["arity"], 0.1) if meta["arity"] > 1 else 0.1
+        yield "map.{}".format(meta["name"]), lambda problem=problem, x0=x0: generate_map_data(
+            problem, x0, map_steps
+        )
+
+
+def _jit_benchmarks():
+    """Right hand side evaluations and map iterations interpreted and compiled with numba."""
+    from . import jit
+    from .maps import generate_map_data
+    from .maps.maps import henon
+    from .ode import lorenz
+    from .ode.not_so_simple_ode import yeast_glycolysis
+
+    if not jit.available():
+        return
+
+    def evaluate(rhs, y):
+        for _ in range(rhs_evaluations):
+            np.asarray(rhs(y, 0.0))  # odeint converts the right hand side to an array
+
+    for name, problem, arity in (("lorenz", lorenz, 3), ("yeast_glycolysis", yeast_glycolysis(), 7)):
+        y = np.linspace(0.5, 1.5, arity)
+        yield "jit.{}.python".format(name), lambda problem=problem, y=y: evaluate(problem(), y)
+        # compiled on the first call and cached, the best of the repeated runs excludes the compilation
+        yield "jit.{}.jit".format(name), lambda problem=problem, y=y, arity=arity: evaluate(
+            jit.ode_kernel(problem, arity), y
+        )
+
+    x0 = np.full(2, 0.1)
+    for backend in ("python", "jit"):
+        yield "jit.henon.{}".format(backend), lambda backend=backend: generate_map_data(
+            henon, x0, map_steps, backend=backend
+        )
+
+
+def _sr_benchmarks():
+    from .symbolic_regression import all_problems
+    from .symbolic_regression import keijzer
+    from .symbolic_regression import korns
+    from .symbolic_regression import koza
+    from .symbolic_regression import nguyen
+    from .symbolic_regression import pagie
+    from .symbolic_regression import vladislavleva
+    from .symbolic_regression.util import arity
+    from .symbolic_regression.util import generate_uniform_data_set
+
+    for name, problem in sorted(all_problems.items()):
+        yield "sr.{}".format(name), lambda problem=problem: problem()
+
+    # the generators have fixed sizes, the scaled benchmarks evaluate their test functions on many points
+    for module in (keijzer, korns, koza, nguyen, pagie, vladislavleva):
+        for name, func in sorted(vars(module).items()):
+            if "_func" in name:
+                yield "sr.{}.scaled".format(name), lambda func=func: generate_uniform_data_set(
+                    func, sr_scaled_points, [(0.1, 5.0)] * arity(func), rng=0
+                )
+                # the same points evaluated in one call and one point at a time
+                data = np.random.RandomState(0).uniform(0.1, 5.0, size=(arity(func), sr_elementwise_points))
+                yield "sr.{}.vectorized".format(name), lambda func=func, data=data: func(*data)
+                yield "sr.{}.elementwise".format(name), lambda func=func, data=data: [
+                    func(*point) for point in data.T
+                ]
+
+
+def run(names=None, repeat=3):
+    """Run all benchmarks whose name matches one of the glob patterns in `names`.
+
+    The dataset cache is disabled and floating point warnings are silenced while the benchmarks run.
+
+    Returns:
+        dict: ``meta`` describing the environment and ``results`` mapping benchmark names to
+        their time and memory
+
+    """
+    selected = lambda name: names is None or any(fnmatch.fnmatch(name, pattern) for pattern in names)
+    results = {}
+    if selected("import"):
+        results["import"] = measure_import(repeat)
+
+    previous = cache._cache
+    cache.disable_cache()
+    try:
+        with np.errstate(all="ignore"):
+            for name, func in benchmarks():
+                if selected(name):
+                    results[name] = measure(func, repeat)
+    finally:
+        cache._cache = previous
+
+    meta = dict(
+        version=__version__,
+        python=platform.python_version(),
+        numpy=np.__version__,
+        platform=platform.platform(),
+        time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        repeat=repeat,
+    )
+    return dict(meta=meta, results=results)
+
+
+def compare(results, baseline, tolerance=0.25):
+    """Benchmarks which regressed with respect to a baseline.
+
+    Args:
+        results: output of `run`
+        baseline: output of an earlier `run`
+        tolerance: allowed relative increase of time and memory
+
+    Returns:
+        list of (name, metric, baseline value, new value) tuples
+
+    """
+    regressions = []
+    for name, new in sorted(results["results"].items()):
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        for metric in ("time", "memory"):
+            too_small = metric == "time" and new[metric] - old[metric] < min_time_difference
+            if new[metric] > old[metric] * (1 + tolerance) and not too_small:
+                regressions.append((name, metric, old[metric], new[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="glob patterns of the benchmarks to run, all by default")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs per benchmark")
+    args = parser.parse_args(argv)
+
+    results = run(args.names or None, repeat=args.repeat)
+    for name, r in results["results"].items():
+        print("{:<50} {:>10.4f} s {:>10.1f} MiB".format(name, r["time"], r["memory"] / 2 ** 20))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, metric, old, new in regressions:
+            print("REGRESSION {} {}: {:.4g} -> {:.4g}".format(name, metric, old, new))
+        return int(bool(regressions))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""Content addressed on-disk cache for generated data sets.
+
+Results are stored as one ``.npy`` file per array in a directory named after a hash of the
+generating function, its arguments and the library version. Cached arrays are read back
+memory-mapped and read-only. The least recently used entries are evicted once the cache grows
+beyond its size limit.
+
+The cache is disabled by default. Enable it with `enable_cache` or by setting the
+``REG_BENCH_CACHE_DIR`` environment variable.
+"""
+import collections
+import functools
+import hashlib
+import inspect
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .__version__ import __version__
+
+# part of every key, increased when the layout of cached results changes
+layout_version = 2
+
+
+class DatasetCache:
+    def __init__(self, path=None, max_size=2 ** 30):
+        """Cache in directory `path` holding at most `max_size` bytes."""
+        self.path = Path(path or default_cache_dir())
+        self.max_size = max_size
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def key(self, name, **spec):
+        """Stable hash of a generator name and its arguments or None if they can not be hashed."""
+        h = hashlib.sha256()
+        try:
+            _update(h, (__version__, layout_version, name, spec))
+        except TypeError:
+            return None
+        return h.hexdigest()
+
+    def get(self, key):
+        """Memory-map the arrays stored under `key` or return None."""
+        entry = self.path / key
+        try:
+            files = sorted(entry.glob("*.npy"), key=lambda f: int(f.stem))
+            arrays = [np.load(str(f), mmap_mode="r") for f in files]
+            os.utime(str(entry))
+        except (OSError, ValueError):
+            return None
+        return arrays or None
+
+    def put(self, key, arrays):
+        """Store a sequence of arrays under `key` and evict old entries."""
+        tmp = Path(tempfile.mkdtemp(dir=str(self.path), prefix=".tmp-"))
+        try:
+            for i, array in enumerate(arrays):
+                np.save(str(tmp / "{}.npy".format(i)), np.asarray(array))
+            os.replace(str(tmp), str(self.path / key))
+        except OSError:
+            pass  # another process stored the same entry concurrently
+        finally:
+            shutil.rmtree(str(tmp), ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        """List of (key, size in bytes, last access time) ordered from least to most recently used."""
+        entries = []
+        for entry in self.path.iterdir():
+            if entry.is_dir() and not entry.name.startswith("."):
+                try:
+                    size = sum(f.stat().st_size for f in entry.iterdir())
+                    entries.append((entry.name, size, entry.stat().st_mtime))
+                except OSError:
+                    continue
+        return sorted(entries, key=lambda e: e[2])
+
+    def info(self):
+        """Summary of the cache contents."""
+        entries = self.entries()
+        return dict(
+            path=str(self.path), entries=len(entries), size=sum(e[1] for e in entries), max_size=self.max_size
+        )
+
+    def evict(self, max_size=None):
+        """Remove least recently used entries until the cache fits into `max_size` bytes."""
+        max_size = self.max_size if max_size is None else max_size
+        entries = self.entries()
+        size = sum(e[1] for e in entries)
+        for key, entry_size, _ in entries:
+            if size <= max_size:
+                break
+            shutil.rmtree(str(self.path / key), ignore_errors=True)
+            size -= entry_size
+
+    def clear(self):
+        """Remove all entries."""
+        self.evict(max_size=0)
+
+
+_cache = None
+
+
+def enable_cache(path=None, max_size=2 ** 30):
+    """Enable the dataset cache for all generators and loaders."""
+    global _cache
+    _cache = DatasetCache(path, max_size=max_size)
+    return _cache
+
+
+def disable_cache():
+    global _cache
+    _cache = False
+
+
+def get_cache():
+    """Active cache or None if caching is disabled."""
+    global _cache
+    if _cache is None:
+        path = os.environ.get("REG_BENCH_CACHE_DIR")
+        _cache = DatasetCache(path, int(os.environ.get("REG_BENCH_CACHE_SIZE", 2 ** 30))) if path else False
+    return _cache or None
+
+
+def cached(restore=tuple, cacheable=lambda args: True):
+    """Cache the arrays returned by a generator.
+
+    Args:
+        restore: builds the return value from the list of cached arrays
+        cacheable: predicate on the bound arguments, results of non-deterministic calls are not cached
+
+    """
+
+    def inner(func):
+        signature = inspect.signature(func)
+        name = "{}.{}".format(func.__module__, func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            if cache is None:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = cacheable(bound.arguments) and cache.key(name, **bound.arguments)
+            if not key:
+                return func(*args, **kwargs)
+            arrays = cache.get(key)
+            if arrays is None:
+                result = func(*args, **kwargs)
+                cache.put(key, result)
+                return result
+            return restore(arrays)
+
+        return wrapper
+
+    return inner
+
+
+def memoize(maxsize=128):
+    """Keep the results of the last `maxsize` calls in memory, keyed like `cached` on the arguments.
+
+    Calls with arguments that can not be hashed, e.g. lambdas, are not memoized.
+    """
+
+    def inner(func):
+        signature = inspect.signature(func)
+        results = collections.OrderedDict()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            h = hashlib.sha256()
+            try:
+                _update(h, dict(bound.arguments))
+            except TypeError:
+                return func(*args, **kwargs)
+            key = h.hexdigest()
+            if key in results:
+                results.move_to_end(key)
+                return results[key]
+            result = results[key] = func(*args, **kwargs)
+            if len(results) > maxsize:
+                results.popitem(last=False)
+            return result
+
+        wrapper.cache_clear = results.clear
+        return wrapper
+
+    return inner
+
+
+def default_cache_dir():
+    """Directory of the cache if no path is given, ``reg_bench`` in the user cache directory."""
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "reg_bench")
+
+
+def _update(h, obj):
+    """Feed a canonical representation of `obj` into the hash `h`."""
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        h.update("{}:{!r};".format(type(obj).__name__, obj).encode())
+    elif isinstance(obj, np.generic):
+        _update(h, obj.item())
+    elif isinstance(obj, np.dtype):
+        h.update("dtype:{};".format(obj.str).encode())
+    elif isinstance(obj, np.ndarray):
+        obj = np.ascontiguousarray(obj)
+        h.update("ndarray:{}:{};".format(obj.dtype.str, obj.shape).encode())
+        h.update(obj.tobytes())
+    elif isinstance(obj, dict):
+        h.update("dict:{};".format(len(obj)).encode())
+        for k in sorted(obj, key=str):
+            _update(h, k)
+            _update(h, obj[k])
+    elif isinstance(obj, (list, tuple, range)):
+        h.update("{}:{};".format(type(obj).__name__, len(obj)).encode())
+        for item in obj:
+            _update(h, item)
+    elif isinstance(obj, functools.partial):
+        _update(h, ("partial", obj.func, obj.args, obj.keywords))
+    elif callable(obj) and hasattr(obj, "__qualname__"):
+        if "<" in obj.__qualname__ or not isinstance(getattr(obj, "__self__", None), (type(None), type(np))):
+            raise TypeError("Can not hash lambdas, local functions and bound methods")
+        h.update("callable:{}.{};".format(getattr(obj, "__module__", None), obj.__qualname__).encode())
+    elif hasattr(obj, "__dict__") and callable(obj):
+        _update(h, (type(obj), vars(obj)))
+    else:
+        raise TypeError("Can not hash {!r}".format(obj))
@@ -0,0 +1,163 @@
+"""Packed catalog of the whole suite for a library version and seed.
+
+All problems of `reg_bench.suite` are generated once at their canonical size and packed into a
+single file. Arrays are stored back to back, aligned to 64 bytes, followed by a JSON index with
+the offset, shape and dtype of every array and the metadata of `reg_bench.export`::
+
+    [arrays ...][index JSON][index length: uint64][magic]
+
+`lookup` reads the index once and memory-maps only the arrays of the requested problem and split,
+so workers open the catalog instead of regenerating the suite::
+
+    python -m reg_bench.catalog --seed 0
+    train = reg_bench.catalog.lookup("sr", "generate_keijzer4", split="train")
+"""
+import argparse
+import functools
+import json
+import os
+import pathlib
+import struct
+import sys
+import tempfile
+
+import numpy as np
+
+from . import export
+from . import suite
+from .__version__ import __version__
+from .cache import default_cache_dir
+from .dataset import Dataset
+
+
+magic = b"REGBENCH"
+alignment = 64
+
+# arrays of each split in the layout of `reg_bench.export.to_arrays`
+splits = dict(
+    ode=dict(data=["data"], target=["target"]),
+    map=dict(data=["orbit"], target=["orbit"]),
+    sr=dict(train=["train_X", "train_y"], test=["test_X", "test_y"]),
+)
+
+
+def default_path(seed=0):
+    """Location of the catalog of this library version and `seed` in the cache directory."""
+    return pathlib.Path(default_cache_dir()) / "catalog-{}-{}.bin".format(__version__, seed)
+
+
+def build_catalog(path=None, seed=0, n_jobs=None, families=suite.families, names=None):
+    """Generate the suite and pack it into a catalog file.
+
+    The file is written next to `path` and moved into place once complete.
+
+    Args:
+        path: catalog file, defaults to `default_path`
+        seed, n_jobs, families, names: passed to `reg_bench.suite.generate_suite`
+
+    Returns:
+        path of the catalog
+
+    """
+    path = pathlib.Path(path or default_path(seed))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    problems = {}
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            results = suite.generate_suite(seed=seed, n_jobs=n_jobs, families=families, names=names)
+            for family, name, result in results:
+                arrays, meta = export.to_arrays(family, name, result)
+                meta["arrays"] = {key: _write_array(f, array) for key, array in arrays.items()}
+                problems["{}/{}".format(family, name)] = meta
+            index = json.dumps(dict(version=__version__, seed=seed, problems=problems), ensure_ascii=False)
+            index = index.encode()
+            f.write(index)
+            f.write(struct.pack("<Q", len(index)))
+            f.write(magic)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, str(path))
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+def _write_array(f, array):
+    array = np.ascontiguousarray(array)
+    f.write(b"\0" * (-f.tell() % alignment))
+    spec = dict(offset=f.tell(), shape=list(array.shape), dtype=array.dtype.str)
+    f.write(array.tobytes())
+    return spec
+
+
+def read_index(path=None, seed=0):
+    """Index of a catalog: version, seed and the metadata and array locations of every problem."""
+    path = pathlib.Path(path or default_path(seed))
+    return _read_index(str(path), path.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=16)
+def _read_index(path, mtime):
+    with open(path, "rb") as f:
+        f.seek(-len(magic) - 8, os.SEEK_END)
+        size, tag = struct.unpack("<Q", f.read(8))[0], f.read(len(magic))
+        if tag != magic:
+            raise ValueError("{} is not a reg_bench catalog".format(path))
+        f.seek(-len(magic) - 8 - size, os.SEEK_END)
+        return json.loads(f.read(size).decode())
+
+
+def lookup(family, name, split=None, path=None, seed=0):
+    """Memory-map a problem of a catalog.
+
+    Args:
+        family, name: problem, see `reg_bench.suite.tasks`
+        split: None for the whole problem in the layout of `reg_bench.suite.run_task`, data or
+            target for ode and map problems, train or test for symbolic regression problems
+        path: catalog file, defaults to `default_path`
+        seed: seed of the default catalog
+
+    Returns:
+        the problem or the requested split as read-only memory-mapped arrays
+
+    """
+    path = pathlib.Path(path or default_path(seed))
+    meta = read_index(path)["problems"]["{}/{}".format(family, name)]
+    if split is None:
+        keys = meta["arrays"]
+    elif split in splits[family]:
+        keys = splits[family][split]
+    else:
+        raise ValueError("Unknown split {} of {}, one of {}".format(split, family, ", ".join(splits[family])))
+    arrays = {key: _map(path, meta["arrays"][key]) for key in keys}
+    if split is None:
+        return export.from_arrays(family, arrays, meta)
+    if family == "sr":
+        return Dataset(*(arrays[key] for key in keys))
+    if family == "map":
+        return arrays["orbit"][:-1] if split == "data" else arrays["orbit"][1:]
+    return arrays[split]
+
+
+def _map(path, spec):
+    if not np.prod(spec["shape"]):
+        return np.empty(spec["shape"], dtype=spec["dtype"])
+    shape = tuple(spec["shape"])
+    return np.memmap(str(path), dtype=spec["dtype"], mode="r", offset=spec["offset"], shape=shape)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", help="catalog file, defaults to the cache directory")
+    parser.add_argument("--seed", type=int, default=0, help="master seed of the suite")
+    parser.add_argument("--n-jobs", type=int, default=None, help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    path = build_catalog(args.path, seed=args.seed, n_jobs=args.n_jobs)
+    print("Wrote {} problems to {}".format(len(read_index(path)["problems"]), path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Data set record shared by the ode, map and symbolic regression generators.
+
+`Dataset` stores samples along axis 0 of `data` and `target`: time steps for trajectories,
+iterations for orbits and test points for symbolic regression problems. It unpacks like the
+``(data, target)`` pairs the generators used to return and gives dict style access to its fields
+like `sklearn.utils.Bunch`, without importing scikit-learn. Windows and train/test splits are views.
+"""
+import numpy as np
+
+
+class Dataset:
+    """Samples `data` with targets `target` and optional timestamps, initial state and parameters.
+
+    Further fields passed as keywords, e.g. ``exact_target`` or ``report``, are stored in `extras`
+    and are available as attributes.
+    """
+
+    __slots__ = ("data", "target", "t", "x0", "params", "extras")
+
+    def __init__(self, data, target, t=None, x0=None, params=None, **extras):
+        set_ = object.__setattr__  # bypasses __setattr__, which is only needed for extras
+        set_(self, "data", data)
+        set_(self, "target", target)
+        set_(self, "t", t)
+        set_(self, "x0", x0)
+        set_(self, "params", params)
+        set_(self, "extras", extras)
+
+    def __getattr__(self, name):
+        if name != "extras":
+            try:
+                return self.extras[name]
+            except KeyError:
+                pass
+        raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        if name in Dataset.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            self.extras[name] = value
+
+    def __getitem__(self, key):
+        """Field by name or ``data`` and ``target`` by position 0 and 1."""
+        if isinstance(key, str):
+            if key not in self:
+                raise KeyError(key)
+            return getattr(self, key)
+        return (self.data, self.target)[key]
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def keys(self):
+        """Names of the fields which are set."""
+        fields = [k for k in ("data", "target", "t", "x0", "params") if getattr(self, k) is not None]
+        return fields + list(self.extras)
+
+    def __iter__(self):
+        """Iterate over ``data`` and ``target`` for tuple unpacking, not over the samples."""
+        return iter((self.data, self.target))
+
+    def __len__(self):
+        """Number of samples, unlike iteration which always yields the two arrays."""
+        return len(self.data)
+
+    def __reduce__(self):
+        return _restore, (self.data, self.target, self.t, self.x0, self.params, self.extras)
+
+    def __repr__(self):
+        shapes = ", ".join("{}={}".format(k, np.shape(self[k])) for k in ("data", "target", "t") if k in self)
+        return "Dataset({})".format(shapes)
+
+    def window(self, start=None, stop=None, step=None):
+        """View of the samples ``start:stop:step``.
+
+        Timestamps and extras with one entry per sample, e.g. ``exact_target``, are sliced along,
+        other extras are passed on as they are.
+        """
+        index = slice(start, stop, step)
+        cut = lambda x: x[index] if self.is_aligned(x) else x
+        target = None if self.target is None else self.target[index]
+        extras = {k: cut(v) for k, v in self.extras.items()}
+        return Dataset(self.data[index], target, cut(self.t), self.x0, self.params, **extras)
+
+    def is_aligned(self, x):
+        """Whether `x` has one entry per sample along axis 0."""
+        return x is not None and np.ndim(x) > 0 and len(x) == len(self)
+
+    def split(self, at):
+        """Views of the samples before and after `at`, an index or a fraction of the samples."""
+        if isinstance(at, float):
+            at = int(round(at * len(self)))
+        return self.window(stop=at), self.window(start=at)
+
+    def Xy(self):
+        """Inputs of shape (n_samples, n_features) and targets as expected by scikit-learn."""
+        data = np.asarray(self.data)
+        return data.reshape(len(data), -1), self.target
+
+
+def _restore(data, target, t, x0, params, extras):
+    return Dataset(data, target, t, x0, params, **extras)
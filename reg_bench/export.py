@@ -0,0 +1,260 @@
+"""Export of generated data sets to disk.
+
+Problems of the suite are written to a directory with a ``manifest.json`` describing every
+problem: its family, registry metadata (arity, tags, type), parameters and the shape and dtype of
+its arrays. Arrays are stored sample-major like in `reg_bench.dataset.Dataset`. Map orbits are
+stored once, data and target are loaded as views of the orbit.
+
+Formats:
+
+- ``npy``: one ``.npy`` file per array, loaded memory-mapped without copying
+- ``npz``: one compressed ``.npz`` archive per problem, arrays are decompressed on access
+- ``hdf5``: one ``suite.h5`` file with a group per problem and chunked, gzip compressed datasets,
+  needs h5py, the arrays of a problem are read into memory and the file is closed
+- ``parquet``: one file per array with a column per state or feature, written in compressed row
+  groups of `chunk_size` rows, needs pyarrow, the columns are decoded into one new sample-major
+  array
+- ``arrow``: one uncompressed Arrow IPC file per array holding the flattened array as a single
+  column, needs pyarrow, loaded memory-mapped without copying
+
+::
+
+    python -m reg_bench.export suite/ --format npy
+    train, test = reg_bench.export.load("suite/", "sr", "generate_keijzer4")
+"""
+import argparse
+import json
+import pathlib
+import sys
+
+import numpy as np
+
+from . import suite
+from .__version__ import __version__
+from .dataset import Dataset
+
+
+formats = ("npy", "npz", "hdf5", "parquet", "arrow")
+
+
+def export_suite(
+    path, format="npy", seed=0, n_jobs=1, families=suite.families, names=None, chunk_size=2 ** 16
+):
+    """Generate problems of the suite and write them to `path`.
+
+    Args:
+        path: output directory
+        format: one of `formats`
+        seed, n_jobs, families, names: passed to `reg_bench.suite.generate_suite`
+        chunk_size: number of rows per chunk or row group for hdf5 and parquet
+
+    Returns:
+        dict: the manifest
+
+    """
+    results = suite.generate_suite(seed=seed, n_jobs=n_jobs, families=families, names=names)
+    return write(path, results, format=format, chunk_size=chunk_size, seed=seed)
+
+
+def write(path, results, format="npy", chunk_size=2 ** 16, **info):
+    """Write data sets to `path`.
+
+    Args:
+        path: output directory
+        results: iterable of (family, name, result) as yielded by `reg_bench.suite.generate_suite`
+        format: one of `formats`
+        chunk_size: number of rows per chunk or row group for hdf5 and parquet
+        info: additional entries of the manifest, e.g. the seed
+
+    Returns:
+        dict: the manifest
+
+    """
+    if format not in formats:
+        raise ValueError("Unknown format: {}".format(format))
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    problems = {}
+    for family, name, result in results:
+        arrays, meta = to_arrays(family, name, result)
+        _writers[format](path, family, name, arrays, meta, chunk_size)
+        meta["arrays"] = {k: dict(shape=list(v.shape), dtype=v.dtype.str) for k, v in arrays.items()}
+        problems["{}/{}".format(family, name)] = meta
+    manifest = dict(info, version=__version__, format=format, problems=problems)
+    with open(str(path / "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+    return manifest
+
+
+def read_manifest(path):
+    with open(str(pathlib.Path(path) / "manifest.json")) as f:
+        return json.load(f)
+
+
+def load(path, family, name, manifest=None):
+    """Load a problem written by `write` in the layout returned by `reg_bench.suite.run_task`."""
+    manifest = manifest or read_manifest(path)
+    meta = manifest["problems"]["{}/{}".format(family, name)]
+    arrays = _readers[manifest["format"]](pathlib.Path(path), family, name, meta["arrays"])
+    return from_arrays(family, arrays, meta)
+
+
+def to_arrays(family, name, result):
+    """Split the result of a task into a dict of sample-major arrays and JSON metadata."""
+    meta = dict(family=family, name=name, **_registry_meta(family, name))
+    if family == "ode":
+        keys = [k for k in ("data", "target", "exact_target", "t", "x0") if k in result]
+        meta["params"] = {k: float(v) for k, v in result.params.items()}
+        return {k: np.asarray(result[k]) for k in keys}, meta
+    if family == "map":
+        data, target = result
+        return dict(orbit=np.concatenate([data, target[-1:]])), meta
+    train, test = result
+    arrays = dict(train_X=train.data, train_y=train.target, test_X=test.data, test_y=test.target)
+    meta["arity"] = np.shape(train.data)[1]
+    return {k: np.asarray(v) for k, v in arrays.items()}, meta
+
+
+def from_arrays(family, arrays, meta):
+    """Inverse of `to_arrays`, views into `arrays` where possible."""
+    if family == "ode":
+        return Dataset(params=meta["params"], **arrays)
+    if family == "map":
+        return Dataset(arrays["orbit"][:-1], arrays["orbit"][1:])
+    return Dataset(arrays["train_X"], arrays["train_y"]), Dataset(arrays["test_X"], arrays["test_y"])
+
+
+def _registry_meta(family, name):
+    if family == "sr":
+        return dict(type="sr", tags=[])
+    if family == "ode":
+        from .ode.simple_ode import all_ode as registry
+    else:
+        from .maps import all_maps as registry
+    meta = next(m for m in registry.values() if m["name"] == name)
+    return dict(type=family, arity=meta["arity"], tags=list(meta["tags"]))
+
+
+def _write_npy(path, family, name, arrays, meta, chunk_size):
+    directory = path / family / name
+    directory.mkdir(parents=True, exist_ok=True)
+    for key, array in arrays.items():
+        np.save(str(directory / "{}.npy".format(key)), array)
+
+
+def _read_npy(path, family, name, keys):
+    return {k: np.load(str(path / family / name / "{}.npy".format(k)), mmap_mode="r") for k in keys}
+
+
+def _write_npz(path, family, name, arrays, meta, chunk_size):
+    (path / family).mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(str(path / family / "{}.npz".format(name)), **arrays)
+
+
+def _read_npz(path, family, name, keys):
+    archive = np.load(str(path / family / "{}.npz".format(name)))
+    return {k: archive[k] for k in keys}
+
+
+def _write_hdf5(path, family, name, arrays, meta, chunk_size):
+    import h5py
+
+    with h5py.File(str(path / "suite.h5"), "a") as f:
+        group = f.require_group(family)
+        if name in group:
+            del group[name]
+        group = group.create_group(name)
+        group.attrs["meta"] = json.dumps(meta, ensure_ascii=False)
+        for key, array in arrays.items():
+            chunks = (min(chunk_size, len(array)),) + array.shape[1:] if array.ndim and array.size else None
+            group.create_dataset(key, data=array, chunks=chunks, compression="gzip" if chunks else None)
+
+
+def _read_hdf5(path, family, name, keys):
+    import h5py
+
+    with h5py.File(str(path / "suite.h5"), "r") as f:
+        return {k: f[family][name][k][()] for k in keys}
+
+
+def _write_parquet(path, family, name, arrays, meta, chunk_size):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    directory = path / family / name
+    directory.mkdir(parents=True, exist_ok=True)
+    for key, array in arrays.items():
+        columns = array.reshape(len(array) if array.ndim else 1, -1).T
+        table = pa.table({str(i): column for i, column in enumerate(columns)})
+        table = table.replace_schema_metadata({"meta": json.dumps(meta, ensure_ascii=False)})
+        pq.write_table(
+            table, str(directory / "{}.parquet".format(key)), row_group_size=chunk_size, compression="zstd"
+        )
+
+
+def _read_parquet(path, family, name, keys):
+    import pyarrow.parquet as pq
+
+    arrays = {}
+    for key, spec in keys.items():
+        table = pq.read_table(str(path / family / name / "{}.parquet".format(key)), memory_map=True)
+        columns = [c.to_numpy() for c in table.columns]
+        arrays[key] = np.stack(columns, axis=-1).reshape(spec["shape"]).astype(spec["dtype"], copy=False)
+    return arrays
+
+
+def _write_arrow(path, family, name, arrays, meta, chunk_size):
+    import pyarrow as pa
+
+    directory = path / family / name
+    directory.mkdir(parents=True, exist_ok=True)
+    for key, array in arrays.items():
+        # one record batch, so the column is a single buffer which can be mapped as the whole array
+        table = pa.table({key: np.ascontiguousarray(array).ravel()})
+        with pa.OSFile(str(directory / "{}.arrow".format(key)), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+
+
+def _read_arrow(path, family, name, keys):
+    import pyarrow as pa
+
+    arrays = {}
+    for key, spec in keys.items():
+        reader = pa.ipc.open_file(pa.memory_map(str(path / family / name / "{}.arrow".format(key))))
+        if not reader.num_record_batches:
+            arrays[key] = np.empty(spec["shape"], dtype=spec["dtype"])
+            continue
+        column = reader.get_batch(0).column(0).to_numpy(zero_copy_only=True)
+        arrays[key] = column.reshape(spec["shape"])
+    return arrays
+
+
+_writers = dict(npy=_write_npy, npz=_write_npz, hdf5=_write_hdf5, parquet=_write_parquet, arrow=_write_arrow)
+_readers = dict(npy=_read_npy, npz=_read_npz, hdf5=_read_hdf5, parquet=_read_parquet, arrow=_read_arrow)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="output directory")
+    parser.add_argument("names", nargs="*", help="names of the problems to export, all by default")
+    parser.add_argument("--format", choices=formats, default="npy")
+    parser.add_argument("--seed", type=int, default=0, help="master seed of the suite")
+    parser.add_argument("--n-jobs", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=2 ** 16, help="rows per chunk for hdf5 and parquet")
+    args = parser.parse_args(argv)
+
+    manifest = export_suite(
+        args.path,
+        format=args.format,
+        seed=args.seed,
+        n_jobs=args.n_jobs,
+        names=args.names or None,
+        chunk_size=args.chunk_size,
+    )
+    print("Wrote {} problems to {}".format(len(manifest["problems"]), args.path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Optional JIT compilation of the ode right hand sides and the maps with numba.
+
+The closures returned by the problem generators are compiled in nopython mode as they are and
+wrapped in kernels which avoid building Python lists and tuples: `jit_ode` returns a right hand
+side writing into a new array and `jit_map` returns a kernel iterating whole orbits. Without
+numba, or if a closure can not be compiled, both return None after warning, callers then use the
+interpreted closures. `ode_kernel` and `map_kernel` cache the compiled kernels per problem and
+parameter set.
+"""
+import functools
+import types
+import warnings
+
+import numpy as np
+
+from .cache import memoize
+
+
+@functools.lru_cache(maxsize=None)
+def _numba():
+    try:
+        import numba
+    except ImportError:
+        warnings.warn("numba is not installed, falling back to the interpreted problems")
+        return None
+    return numba
+
+
+def available():
+    """Whether a JIT backend is installed."""
+    return _numba() is not None
+
+
+def ode_kernel(problem, arity, params=None):
+    """Compiled right hand side of an ode generator or None, see `jit_ode`."""
+    return _cached(jit_ode, problem, arity, params)
+
+
+def map_kernel(problem, arity, params=None):
+    """Compiled orbit kernel of a map generator or None, see `jit_map`."""
+    return _cached(jit_map, problem, arity, params)
+
+
+def _cached(jit, problem, arity, params):
+    try:
+        key = tuple(sorted((params or {}).items()))
+        hash(key)
+    except TypeError:  # e.g. array valued params
+        return jit(problem(**(params or {})), arity)
+    return _kernel(jit, problem, arity, key)
+
+
+@memoize()
+def _kernel(jit, problem, arity, params):
+    return jit(problem(**dict(params)), arity)
+
+
+def _unwrap(func):
+    """Copy of a closure without the ``__wrapped__`` attribute set by `functools.wraps`.
+
+    numba reads the signature of the wrapped generator instead of the closure otherwise.
+    """
+    code, defaults, closure = func.__code__, func.__defaults__, func.__closure__
+    return types.FunctionType(code, func.__globals__, func.__name__, defaults, closure)
+
+
+def _compile(build, name):
+    numba = _numba()
+    if numba is None:
+        return None
+    try:
+        return build(numba)
+    except Exception as e:  # numba raises many different errors for unsupported code
+        warnings.warn("Can not compile {}, falling back to Python: {}".format(name, e))
+        return None
+
+
+def jit_ode(dy, arity):
+    """Compile a right hand side ``dy(y, t)`` of a system with `arity` states.
+
+    Returns:
+        compiled ``rhs(y, t)`` returning an array or None
+
+    """
+
+    def build(numba):
+        core = numba.njit(error_model="numpy")(_unwrap(dy))
+
+        @numba.njit("float64[:](float64[:], float64)", error_model="numpy")
+        def rhs(y, t):
+            out = core(y, t)
+            dy = np.empty(arity)
+            for i in range(arity):
+                dy[i] = out[i]
+            return dy
+
+        return rhs
+
+    return _compile(build, getattr(dy, "__name__", "rhs"))
+
+
+def jit_map(f, arity):
+    """Compile a map ``f(state)`` of dimension `arity` into an orbit kernel.
+
+    Returns:
+        compiled ``orbits(x)`` filling ``x[:, 1:]`` of an array of shape (n_orbits, t + 1, arity)
+        by iterating from ``x[:, 0]``, or None
+
+    """
+
+    def build(numba):
+        core = numba.njit(error_model="numpy")(_unwrap(f))
+
+        if arity == 1:
+
+            @numba.njit("void(float64[:, :, :])", error_model="numpy")
+            def orbits(x):
+                for j in range(x.shape[0]):
+                    state = x[j, 0, 0]
+                    for i in range(1, x.shape[1]):
+                        state = core(state)
+                        x[j, i, 0] = state
+
+        else:
+            unpack = _make_unpack(numba, arity)
+
+            @numba.njit("void(float64[:, :, :])", error_model="numpy")
+            def orbits(x):
+                for j in range(x.shape[0]):
+                    state = unpack(x[j, 0])
+                    for i in range(1, x.shape[1]):
+                        state = core(state)
+                        for k in range(arity):
+                            x[j, i, k] = state[k]
+
+        return orbits
+
+    return _compile(build, getattr(f, "__name__", "map"))
+
+
+def _make_unpack(numba, arity):
+    """Compiled conversion of a state array into the tuple the maps take."""
+    namespace = {}
+    args = ", ".join("x[{}]".format(i) for i in range(arity))
+    exec("def unpack(x):\n    return ({},)".format(args), namespace)
+    return numba.njit(namespace["unpack"])
@@ -0,0 +1,154 @@
+"""Lyapunov exponents and attractor statistics of the maps and odes.
+
+Exponents are estimated from the growth of tangent vectors which are orthonormalised by QR
+decompositions, the logarithms of the diagonal of R accumulate to the spectrum.
+
+- maps: the tangent vectors of a whole batch of orbits are propagated together. The Jacobians
+  are evaluated for all orbits at once by complex step differentiation, which is exact up to
+  rounding for the analytic maps.
+- odes: the variational equations ``dQ/dt = J(y) Q`` are integrated together with the trajectory
+  using the analytic Jacobian of `reg_bench.ode.symbolic` and orthonormalised every `dt`.
+
+Results are kept in memory per problem, initial conditions and parameter set and stored in the
+on-disk cache of `reg_bench.cache` if it is enabled.
+"""
+import numpy as np
+
+from .cache import cached
+from .cache import memoize
+
+
+_stacked_qr = np.lib.NumpyVersion(np.__version__) >= "1.22.0"
+
+
+@memoize()
+@cached()
+def _map_spectrum(problem, x0, n_steps, params, n_exponents, transient):
+    from .maps import generate_map_orbits
+
+    f = problem(**(params or {}))
+    x = generate_map_orbits(problem, x0, transient)[:, -1]
+    n_orbits, arity = x.shape
+    k = n_exponents or arity
+    q = np.broadcast_to(np.eye(arity)[:, :k], (n_orbits, arity, k))
+    total = np.zeros((n_orbits, k))
+    for _ in range(n_steps):
+        q, r = _qr(_map_jacobian(f, x) @ q)
+        total += np.log(np.abs(np.diagonal(r, axis1=1, axis2=2)))
+        x = _images(f, x)
+    return (total / n_steps,)
+
+
+def map_lyapunov_spectrum(problem, x0, n_steps=10 ** 4, params=None, n_exponents=None, transient=1000):
+    """Lyapunov spectrum of a map for a batch of orbits.
+
+    Args:
+        problem: map generator
+        x0: initial conditions of shape (n_orbits, dim) or (dim,), a scalar for one dimensional maps
+        n_steps: number of iterations the exponents are averaged over
+        params: kwargs for problem
+        n_exponents: number of exponents, 1 only estimates the maximal exponent, all by default
+        transient: number of iterations discarded before averaging
+
+    Returns:
+        exponents per iteration of shape (n_orbits, n_exponents) in descending order
+
+    """
+    x0 = np.asarray(x0, dtype=float)
+    exponents = _map_spectrum(problem, x0, n_steps, params, n_exponents, transient)[0]
+    return np.sort(exponents, axis=-1)[:, ::-1]
+
+
+def _qr(a):
+    """QR decompositions of a stack of matrices, numpy before 1.22 only decomposes one at a time."""
+    if _stacked_qr:
+        return np.linalg.qr(a)
+    q, r = zip(*map(np.linalg.qr, a))
+    return np.stack(q), np.stack(r)
+
+
+def _images(f, x):
+    """Images of the states `x` of shape (n_orbits, dim) under the map `f`."""
+    out = f(x.T) if x.shape[1] > 1 else [f(x[:, 0])]
+    return np.stack([np.broadcast_to(c, x.shape[:1]) for c in out], axis=1)
+
+
+def _map_jacobian(f, x, h=1e-20):
+    """Jacobians of shape (n_orbits, dim, dim) of a map at the states `x` of shape (n_orbits, dim)."""
+    columns = []
+    for j in range(x.shape[1]):
+        z = x.astype(complex)
+        z[:, j] += 1j * h
+        columns.append(_images(f, z).imag / h)
+    return np.stack(columns, axis=-1)
+
+
+@memoize()
+@cached()
+def _ode_spectrum(problem, x0, t_max, dt, ode_params, n_exponents, transient):
+    from .ode.integrate import integrate_ode
+    from .ode.solvers import _stack
+    from .ode.solvers import solve
+    from .ode.symbolic import compile_ode
+
+    arity = len(x0)
+    k = n_exponents or arity
+    rhs, jac = compile_ode(problem, arity, ode_params)
+
+    def variational(z, t):
+        y, q = z[:arity], z[arity:].reshape(arity, k)
+        dq = np.asarray(jac(y, t), dtype=float) @ q
+        return np.concatenate([_stack(rhs(y, t)), dq.ravel()])
+
+    y = x0
+    if transient:
+        t = np.linspace(0, transient, int(np.ceil(transient / dt)) + 1)
+        y = integrate_ode(problem, x0, t, ode_params)[-1]
+    q = np.eye(arity)[:, :k]
+    total = np.zeros(k)
+    n_intervals = int(round(t_max / dt))
+    for i in range(n_intervals):
+        z, _ = solve(variational, np.concatenate([y, q.ravel()]), np.array([i * dt, (i + 1) * dt]))
+        y = z[-1, :arity]
+        q, r = np.linalg.qr(z[-1, arity:].reshape(arity, k))
+        total += np.log(np.abs(np.diagonal(r)))
+    return (total / (n_intervals * dt),)
+
+
+def ode_lyapunov_spectrum(problem, x0, t_max=1000, dt=1.0, ode_params=None, n_exponents=None, transient=100):
+    """Lyapunov spectrum of an ode from its variational equations.
+
+    Args:
+        problem: ode generator
+        x0: initial condition
+        t_max: integration time the exponents are averaged over
+        dt: time between orthonormalisations, short enough that the tangent vectors do not align
+        ode_params: kwargs for problem
+        n_exponents: number of exponents, 1 only estimates the maximal exponent, all by default
+        transient: integration time discarded before averaging
+
+    Returns:
+        exponents per unit time of shape (n_exponents,) in descending order
+
+    """
+    x0 = np.asarray(x0, dtype=float)
+    exponents = _ode_spectrum(problem, x0, t_max, dt, ode_params, n_exponents, transient)[0]
+    return np.sort(exponents)[::-1]
+
+
+def kaplan_yorke_dimension(exponents):
+    """Kaplan-Yorke dimension of the attractor from its full Lyapunov spectrum."""
+    exponents = np.sort(np.asarray(exponents))[::-1]
+    sums = np.cumsum(exponents)
+    if sums[0] < 0:
+        return 0.0
+    j = int(np.flatnonzero(sums >= 0)[-1])
+    if j == len(exponents) - 1:
+        return float(len(exponents))
+    return j + 1 + sums[j] / abs(exponents[j + 1])
+
+
+def attractor_statistics(x):
+    """Mean, standard deviation and bounds of the states of a trajectory of shape (n_t, dim)."""
+    x = np.asarray(x)
+    return dict(mean=x.mean(axis=0), std=x.std(axis=0), min=x.min(axis=0), max=x.max(axis=0))
@@ -1,12 +1,134 @@
 import numpy as np
-from toolz.itertoolz import iterate
-from toolz.itertoolz import take
 
+from ..dataset import Dataset
+from ..utils import as_dtype
 from .maps import all_maps
 
 
-def generate_map_data(problem, x0, t, params):
-    f = problem(params)
-    x = take(iterate(f, x0), t + 1)
-    x = np.array(x)
-    return x[:-1], x[1:]
+def generate_map_data(
+    problem, x0, t, params=None, filename=None, chunk_size=2 ** 16, dtype=None, backend="python"
+):
+    """Iterate a map and return consecutive states as data set.
+
+    Data and target are two overlapping views of the same orbit buffer, no copy is made.
+
+    Args:
+        problem: map generator
+        x0: initial condition, a scalar for one dimensional maps
+        t: number of iterations
+        params: kwargs for problem
+        filename: write the orbit to a memory-mapped ``.npy`` file instead of keeping it in memory
+        chunk_size: number of states computed in memory at once when writing to `filename`
+        dtype: dtype of the orbit, e.g. float32, the map is always iterated in float64
+        backend: python iterates the map as written, jit compiles it with numba if installed
+
+    Returns:
+        `reg_bench.dataset.Dataset` of the states x[:-1] and their images x[1:]
+
+    """
+    x = generate_map_orbits(
+        problem, x0, t, params, filename=filename, chunk_size=chunk_size, dtype=dtype, backend=backend
+    )[0]
+    if np.ndim(x0) == 0:
+        x = x[:, 0]
+    return Dataset(x[:-1], x[1:], x0=x0, params=params)
+
+
+def generate_map_orbits(
+    problem, x0, t, params=None, filename=None, chunk_size=2 ** 16, dtype=None, backend="python"
+):
+    """Iterate many initial conditions of a map at once.
+
+    The map is evaluated on the whole batch of states per step, its components are arrays of
+    shape (n_orbits,). The output is preallocated. The jit backend iterates each orbit in a
+    compiled loop instead, see `reg_bench.jit`.
+
+    Args:
+        problem: map generator
+        x0: initial conditions of shape (n_orbits, dim) or (dim,)
+        t: number of iterations
+        params: kwargs for problem
+        filename: write the orbits to a memory-mapped ``.npy`` file instead of keeping them in memory
+        chunk_size: number of states computed in memory at once when writing to `filename`
+        dtype: dtype of the orbits, e.g. float32
+        backend: python or jit
+
+    Returns:
+        orbits of shape (n_orbits, t + 1, dim)
+
+    """
+    x0 = _initial_state(problem, x0)
+    shape = (x0.shape[0], t + 1, x0.shape[1])
+    dtype = np.dtype(dtype or float)
+    if filename is None and dtype == float:
+        x = np.empty(shape)
+        x[:, 0] = x0
+        _advancer(problem, params, x.shape[2], backend)(x)
+        return x
+
+    if filename is None:
+        x = np.empty(shape, dtype=dtype)
+    else:
+        x = np.lib.format.open_memmap(str(filename), mode="w+", dtype=dtype, shape=shape)
+    start = 0
+    for chunk in iterate_map(problem, x0, t, params=params, chunk_size=chunk_size, backend=backend):
+        x[:, start : start + chunk.shape[1]] = chunk
+        start += chunk.shape[1]
+    if filename is not None:
+        x.flush()
+    return x
+
+
+def iterate_map(problem, x0, t, params=None, chunk_size=2 ** 16, dtype=None, backend="python"):
+    """Stream orbits of a map in chunks of at most `chunk_size` states.
+
+    The last state of a chunk is carried over to the next one, concatenating all chunks along
+    axis 1 yields the output of `generate_map_orbits`. Chunks are computed in float64 and cast to
+    `dtype` if given.
+
+    Yields:
+        chunks of shape (n_orbits, chunk_size, dim)
+
+    """
+    f = problem(**(params or {}))
+    state = _initial_state(problem, x0)
+    advance = _advancer(problem, params, state.shape[1], backend)
+    remaining = t + 1
+    while remaining > 0:
+        chunk = np.empty((state.shape[0], min(chunk_size, remaining), state.shape[1]))
+        chunk[:, 0] = state if remaining == t + 1 else _step(f, state)
+        advance(chunk)
+        state = chunk[:, -1]
+        remaining -= chunk.shape[1]
+        yield as_dtype(chunk, dtype)
+
+
+def _initial_state(problem, x0):
+    x0 = np.asarray(x0, dtype=float)
+    if x0.ndim < 2 and problem in all_maps and all_maps[problem]["arity"] == 1:
+        return x0.reshape(-1, 1)
+    return np.atleast_2d(x0)
+
+
+def _advancer(problem, params, arity, backend):
+    """Function filling x[:, 1:] of an orbit array from x[:, 0]."""
+    if backend == "jit":
+        from .. import jit
+
+        kernel = jit.map_kernel(problem, arity, params)
+        if kernel is not None:
+            return kernel
+    elif backend != "python":
+        raise ValueError("Unknown backend: {}".format(backend))
+    f = problem(**(params or {}))
+    return lambda x: _advance(f, x)
+
+
+def _advance(f, x):
+    """Fill x[:, 1:] by iterating f from x[:, 0]."""
+    for i in range(x.shape[1] - 1):
+        x[:, i + 1] = _step(f, x[:, i])
+
+
+def _step(f, state):
+    return np.asarray(f(state.T)).T
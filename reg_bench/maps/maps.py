@@ -41,11 +41,14 @@ def logistic(r=3.18):
 
 
 @register_map(2, "polynomial")
-def bogdanov(eps, k, mu):
+def bogdanov(eps=0.0, k=1.2, mu=0.0):
     @functools.wraps(bogdanov)
     def f(state):
         x, y = state
-        return x + y, (1 + eps) * y + k * x * (x - 1) + mu * x * y
+        y_1 = (1 + eps) * y + k * x * (x - 1) + mu * x * y
+        return x + y_1, y_1
+
+    return f
 
 
 @register_map(2, "polynomial")
@@ -0,0 +1,160 @@
+"""Cross-validation splitters for trajectories and orbits.
+
+Shuffled folds leak information between neighbouring samples of a trajectory. The splitters here
+keep the temporal order and follow the scikit-learn interface, they can be passed as ``cv`` to
+`sklearn.model_selection.cross_validate` and friends:
+
+- `ForwardChaining`: growing (or sliding) training windows, each followed by a test window
+- `BlockedSplit`: disjoint blocks, each split into a training and a test part with a gap between
+- `TrajectorySplit`: k-fold over whole trajectories, e.g. of `reg_bench.ode.generate_ode_ensemble`
+  or over groups of samples from stacked trajectories
+
+The index arrays yielded by ``split`` are views of one shared ``arange`` wherever a fold is
+contiguous, so no fold allocates memory proportional to the number of samples. ``views`` yields the
+folds of arrays or `reg_bench.dataset.Dataset` records as views of the data itself.
+"""
+import numpy as np
+
+from .dataset import Dataset
+
+
+class _Splitter:
+    def get_n_splits(self, X=None, y=None, groups=None):
+        return self.n_splits
+
+    def split(self, X, y=None, groups=None):
+        """Yield (train, test) index arrays, views of a shared ``arange`` for contiguous folds."""
+        index = np.arange(len(X))
+        index.setflags(write=False)
+        for train, test in self._folds(len(X), groups):
+            yield _take(index, train), _take(index, test)
+
+    def views(self, data, target=None, groups=None):
+        """Yield the folds of `data` and `target` or of a `Dataset`.
+
+        Args:
+            data: array with samples along axis 0 or `reg_bench.dataset.Dataset`
+            target: array with samples along axis 0, optional
+            groups: group labels of the samples, as for ``split``
+
+        Yields:
+            train, test: Datasets, views wherever the fold is contiguous
+
+        """
+        if not isinstance(data, Dataset):
+            data = Dataset(data, target)
+        for train, test in self._folds(len(data), groups):
+            yield _window(data, train), _window(data, test)
+
+
+class ForwardChaining(_Splitter):
+    """Training windows which end before their test windows, the last test window ends the data.
+
+    Args:
+        n_splits: number of folds
+        test_size: samples per test window, by default the data is divided into ``n_splits + 1``
+            equal parts and the first part is only used for training
+        gap: samples left out between the training and the test window
+        max_train_size: maximal number of training samples, a sliding window if set, growing
+            otherwise
+
+    """
+
+    def __init__(self, n_splits=5, test_size=None, gap=0, max_train_size=None):
+        self.n_splits = n_splits
+        self.test_size = test_size
+        self.gap = gap
+        self.max_train_size = max_train_size
+
+    def _folds(self, n, groups):
+        test_size = self.test_size or n // (self.n_splits + 1)
+        first = n - self.n_splits * test_size
+        if first - self.gap <= 0:
+            raise ValueError("Too few samples for {} splits of {} samples.".format(self.n_splits, test_size))
+        for start in range(first, n, test_size):
+            end = start - self.gap
+            begin = 0 if self.max_train_size is None else max(0, end - self.max_train_size)
+            yield slice(begin, end), slice(start, start + test_size)
+
+
+class BlockedSplit(_Splitter):
+    """Disjoint contiguous blocks, the end of each block is used for testing.
+
+    Args:
+        n_splits: number of blocks
+        test_fraction: fraction of each block used for testing
+        gap: samples left out between the training and the test part of a block
+
+    """
+
+    def __init__(self, n_splits=5, test_fraction=0.2, gap=0):
+        self.n_splits = n_splits
+        self.test_fraction = test_fraction
+        self.gap = gap
+
+    def _folds(self, n, groups):
+        bounds = np.linspace(0, n, self.n_splits + 1).astype(int)
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            start = end - int(round(self.test_fraction * (end - begin)))
+            if start - self.gap <= begin or start == end:
+                raise ValueError("Blocks of {} samples are too small.".format(end - begin))
+            yield slice(begin, start - self.gap), slice(start, end)
+
+
+class TrajectorySplit(_Splitter):
+    """K-fold over whole trajectories, each fold tests on a contiguous block of trajectories.
+
+    Without groups every sample is one trajectory, e.g. ensembles of shape (n_traj, n_t, arity).
+    With groups the samples of stacked trajectories are labelled with their trajectory and the
+    samples of each trajectory have to be contiguous.
+
+    Test folds are views, training folds around a test fold in the middle consist of two parts
+    which are concatenated.
+
+    Args:
+        n_splits: number of folds
+
+    """
+
+    def __init__(self, n_splits=5):
+        self.n_splits = n_splits
+
+    def _folds(self, n, groups):
+        if groups is None:
+            starts = np.arange(n + 1)
+        else:
+            groups = np.asarray(groups)
+            changes = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+            if len(np.unique(groups)) != len(changes) + 1:
+                raise ValueError("The samples of each group have to be contiguous.")
+            starts = np.concatenate([[0], changes, [n]])
+        n_groups = len(starts) - 1
+        if n_groups < self.n_splits:
+            raise ValueError("Cannot split {} trajectories into {} folds.".format(n_groups, self.n_splits))
+        bounds = starts[np.linspace(0, n_groups, self.n_splits + 1).astype(int)]
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            train = [s for s in (slice(0, begin), slice(end, n)) if s.stop > s.start]
+            yield train[0] if len(train) == 1 else train, slice(begin, end)
+
+
+def _take(array, fold):
+    if isinstance(fold, slice):
+        return array[fold]
+    return np.concatenate([array[part] for part in fold])
+
+
+def _window(data, fold):
+    if isinstance(fold, slice):
+        return data.window(fold.start, fold.stop)
+    parts = [data.window(part.start, part.stop) for part in fold]
+    # fields with one entry per sample are concatenated, see `Dataset.window`
+    join = lambda x, name: np.concatenate([getattr(p, name) for p in parts]) if data.is_aligned(x) else x
+    extras = {k: join(v, k) for k, v in data.extras.items()}
+    return Dataset(
+        join(data.data, "data"),
+        None if data.target is None else join(data.target, "target"),
+        join(data.t, "t"),
+        data.x0,
+        data.params,
+        **extras,
+    )
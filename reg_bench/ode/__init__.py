@@ -1,6 +1,13 @@
+from ..utils import make_getattr
 from .integrate import generate_ode_data
+from .integrate import generate_ode_ensemble
+from .integrate import integrate_ode
 from .not_so_simple_ode import *
 from .simple_ode import *
-from .simple_ode import all_loaders as simple_ode_loaders
+from .simple_ode import all_loaders
+from .simple_ode import loaders_by_attr
+from .sweep import generate_ode_sweep
+from .windowed import generate_ode_memmap
+from .windowed import iterate_ode_data
 
-all_loaders = {**simple_ode_loaders}
+__getattr__ = make_getattr(__name__, loaders_by_attr)
@@ -0,0 +1,87 @@
+"""Numerical differentiation of trajectories.
+
+Differentiation is delegated to the `derivative` package. ``savitzky_golay`` is provided here
+with `scipy.signal.savgol_filter` (params ``window_length`` and ``polyorder``).
+
+`estimate_derivatives` evaluates several configurations on the same trajectory. The Fourier
+transform and the spline fit are computed once and shared by all ``fft`` and ``cubic_spline``
+configurations, finite differences and Savitzky-Golay filters act on all states at once.
+"""
+import numpy as np
+
+
+def estimate_derivative(t, x, diff_params=None):
+    """Estimate the derivative of a trajectory along the time axis."""
+    diff_params = dict(diff_params or {})
+    if diff_params.get("kind") == "savitzky_golay":
+        diff_params.pop("kind")
+        return _savitzky_golay(t, x, **diff_params)
+
+    from derivative import derivative
+
+    return derivative(t, x, **diff_params)
+
+
+def estimate_derivatives(t, x, configs):
+    """Estimate the derivative of a trajectory with several methods.
+
+    Configurations with the same `config_name` raise a ValueError instead of overwriting each other.
+
+    Args:
+        t: timestamps of shape (n_t,)
+        x: trajectory of shape (n_t, arity)
+        configs: list of `diff_params` dicts, see `estimate_derivative`
+
+    Returns:
+        dict: derivative of each configuration keyed by `config_name`
+
+    """
+    names = [config_name(config) for config in configs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError("Duplicate derivative configs: {}".format(", ".join(duplicates)))
+    shared = {}
+    return {name: _estimate(t, np.asarray(x), dict(config), shared) for name, config in zip(names, configs)}
+
+
+def config_name(config):
+    """Name of a differentiation config, its kind followed by its sorted params."""
+    config = dict(config or {})
+    kind = config.pop("kind", "finitediff")
+    if not config:
+        return kind
+    return "{}({})".format(kind, ", ".join("{}={!r}".format(k, v) for k, v in sorted(config.items())))
+
+
+def _estimate(t, x, config, shared):
+    kind = config.pop("kind", "finitediff")
+    if kind == "finitediff" and not config and len(t) > 2:
+        return _finitediff(t, x)
+    if kind == "fft" and not config:
+        if "fft" not in shared:
+            shared["fft"] = np.fft.fft(x, axis=0)
+        w = 2 * np.pi / (t[-1] - t[0]) * np.fft.fftfreq(len(t)) * len(t)
+        return np.fft.ifft(1j * w.reshape((-1,) + (1,) * (x.ndim - 1)) * shared["fft"], axis=0)
+    if kind == "cubic_spline" and set(config) <= {"order"}:
+        if "spline" not in shared:
+            from scipy.interpolate import CubicSpline
+
+            shared["spline"] = CubicSpline(t, x, axis=0)
+        return shared["spline"].derivative(config.get("order", 1))(t)
+    return estimate_derivative(t, x, dict(config, kind=kind))
+
+
+def _finitediff(t, x):
+    """Second order central differences with one sided differences at the ends on all states."""
+    dt = t[1] - t[0]
+    dx = np.empty(x.shape)
+    dx[1:-1] = (x[2:] - x[:-2]) / (2.0 * dt)
+    dx[0] = (-1.5 * x[0] + 2 * x[1] - 0.5 * x[2]) / dt
+    dx[-1] = (1.5 * x[-1] - 2 * x[-2] + 0.5 * x[-3]) / dt
+    return dx
+
+
+def _savitzky_golay(t, x, window_length=11, polyorder=3):
+    from scipy.signal import savgol_filter
+
+    return savgol_filter(x, window_length, polyorder, deriv=1, delta=t[1] - t[0], axis=0)
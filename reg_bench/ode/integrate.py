@@ -1,10 +1,31 @@
+import contextlib
+import inspect
+import time
+import tracemalloc
 from functools import wraps
 
 import numpy as np
-import scipy.integrate
-from derivative import derivative
 
+from ..cache import cached
+from ..utils import as_dtype
+from ..utils import as_rng
+from .derivatives import estimate_derivative
+from .derivatives import estimate_derivatives
+from .not_so_simple_ode import ODE
+from .solvers import declared_settings
+from .solvers import default_solver
+from .solvers import solve
 
+
+def _deterministic(args):
+    if args.get("callback") is not None:
+        return False  # instrumented calls always do the work they report on
+    if isinstance(args.get("diff_params"), (list, tuple)):
+        return False  # derivatives are returned as mapping
+    return args["noise_amplitude"] == 0 or (args["seed"] is not None and args["noise_pdf"] is None)
+
+
+@cached(cacheable=_deterministic)
 def generate_ode_data(
     problem,
     x0,
@@ -15,6 +36,13 @@ def generate_ode_data(
     noise_params=None,
     noise_kind="additive",
     diff_params=None,
+    backend="python",
+    seed=None,
+    dtype=None,
+    callback=None,
+    solver=None,
+    solver_params=None,
+    target="estimate",
 ):
     """Generate a trajectory and estimate its derivate.
 
@@ -29,14 +57,250 @@ def generate_ode_data(
         noise_amplitude: noise amplitude
         noise_pdf: function which generates noise
         noise_params: kwargs passed to noise_pdf
-        derive_max_order: maximum order derivative
+        diff_params: kwargs passed to derivative or a list of them, then dx is a dict of
+            derivatives keyed by `reg_bench.ode.derivatives.config_name` sharing one trajectory
+        backend: python integrates the right hand side as written, symbolic uses a compiled right
+            hand side and analytic Jacobian with odeint, pyodesys integrates the symbolic system
+            with pyodesys and jit compiles the right hand side with numba if it is installed, see
+            `reg_bench.jit`
+        seed: seed or `numpy.random.Generator` for the default noise pdf, noisy data is only
+            cached for integer seeds
+        dtype: dtype of the returned arrays, e.g. float32, all computations run in float64
+        solver: solver name, defaults to the solver declared by the problem, see `integrate_ode`
+        solver_params: kwargs for the solver, e.g. rtol and atol
+        callback: called with an instrumentation report, instrumented calls bypass the cache
+        target: estimate differentiates the (noisy) trajectory numerically, exact evaluates the
+            right hand side on the noise free trajectory instead and both returns the exact
+            derivative as an additional third array
+
+    The report is a dict with
+
+    - ``stages``: wall time and, if `tracemalloc` is tracing, the memory allocated by the
+      integrate, noise and differentiate stages
+    - ``solver``: step and evaluation counts of the solver, see `integrate_ode`
+    - ``arrays``: shape, dtype and size in bytes of ``t``, ``x`` and ``dx``
 
     Returns:
-        x, dx: trajectory and derivative
+        x, dx: trajectory and derivative, x, dx, dx_exact if target is both
 
     """
-    dy = problem(**(ode_params or {}))
-    x = scipy.integrate.odeint(dy, x0, t)
+    if target not in ("estimate", "exact", "both"):
+        raise ValueError("Unknown target: {}".format(target))
+    report = dict(problem=_name(problem), backend=backend, stages={})
+    with _stage(report, "integrate"):
+        x, stats = integrate_ode(
+            problem,
+            x0,
+            t,
+            ode_params=ode_params,
+            backend=backend,
+            full_output=True,
+            solver=solver,
+            solver_params=solver_params,
+        )
+    if target != "estimate":
+        with _stage(report, "exact"):
+            dx_exact = exact_derivative(problem, t, x, ode_params)
+    with _stage(report, "noise"):
+        x = add_measurement_noise(
+            x,
+            noise_amplitude=noise_amplitude,
+            noise_pdf=noise_pdf,
+            noise_params=noise_params,
+            noise_kind=noise_kind,
+            rng=seed,
+        )
+    if target == "exact":
+        dx = dx_exact
+    else:
+        with _stage(report, "differentiate"):
+            if isinstance(diff_params, (list, tuple)):
+                dx = estimate_derivatives(t, x, diff_params)
+            else:
+                dx = estimate_derivative(t, x, diff_params)
+    dx = {k: as_dtype(v, dtype) for k, v in dx.items()} if isinstance(dx, dict) else as_dtype(dx, dtype)
+    arrays = dict(x=as_dtype(x, dtype), dx=dx)
+    if target == "both":
+        arrays["dx_exact"] = as_dtype(dx_exact, dtype)
+    if callback is not None:
+        flat = dict(t=t, **arrays)
+        if isinstance(dx, dict):
+            flat.update({"dx[{}]".format(k): v for k, v in flat.pop("dx").items()})
+        report.update(solver=stats, arrays={k: _array_info(v) for k, v in flat.items()})
+        callback(report)
+    return tuple(arrays.values())
+
+
+def exact_derivative(problem, t, x, ode_params=None):
+    """Evaluate the right hand side of an ode generator on a whole trajectory at once.
+
+    Args:
+        problem: ode generator
+        t: timestamps of shape (n_t,)
+        x: trajectory of shape (n_t, arity)
+        ode_params: kwargs for problem
+
+    Returns:
+        dx: exact derivative of shape (n_t, arity)
+
+    """
+    out = problem(**(ode_params or {}))(np.asarray(x).T, np.asarray(t))
+    return np.stack(np.broadcast_arrays(*out), axis=1)
+
+
+@contextlib.contextmanager
+def _stage(report, name):
+    """Record the wall time and the traced memory growth of a stage."""
+    memory = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+    start = time.perf_counter()
+    yield
+    if memory is not None:
+        memory = tracemalloc.get_traced_memory()[0] - memory
+    report["stages"][name] = dict(time=time.perf_counter() - start, memory=memory)
+
+
+def _array_info(x):
+    x = np.asarray(x)
+    return dict(shape=x.shape, dtype=x.dtype.str, nbytes=x.nbytes)
+
+
+def _name(problem):
+    return getattr(problem, "__name__", type(problem).__name__)
+
+
+def integrate_ode(
+    problem, x0, t, ode_params=None, backend="python", full_output=False, solver=None, solver_params=None
+):
+    """Integrate an ode generator with the selected backend.
+
+    Args:
+        solver: name of the solver, see `reg_bench.ode.solvers`, defaults to the solver declared
+            by the problem, ignored by the pyodesys backend
+        solver_params: kwargs for the solver, e.g. rtol and atol, added to the declared ones if
+            `solver` is None
+        full_output: also return the solver statistics, see `reg_bench.ode.solvers.solve`
+
+    Returns:
+        x or x, stats
+
+    """
+    if backend == "pyodesys":
+        from . import symbolic
+
+        odesys = symbolic.pyodesys_ode(problem, len(x0), ode_params)
+        result = odesys.integrate(t, x0, integrator="scipy", **(solver_params or {}))
+        info = result.info
+        stats = dict(
+            steps=info["n_steps"] if info.get("n_steps", -1) >= 0 else None,
+            rhs_evaluations=info.get("nfev"),
+            jacobian_evaluations=info.get("njev"),
+            min_step=None,
+            max_step=None,
+            methods=[info["name"]],
+        )
+        return (result.yout, stats) if full_output else result.yout
+
+    vectorized = True
+    if backend == "python":
+        rhs, jac = problem(**(ode_params or {})), None
+    elif backend == "symbolic":
+        from . import symbolic
+
+        rhs, jac = symbolic.compile_ode(problem, len(x0), ode_params)
+    elif backend == "jit":
+        from .. import jit
+
+        rhs, jac = jit.ode_kernel(problem, len(x0), ode_params), None
+        if rhs is None:
+            rhs = problem(**(ode_params or {}))
+        else:
+            vectorized = False  # the kernel is compiled for single states only
+    else:
+        raise ValueError("Unknown backend: {}".format(backend))
+    if solver is None:
+        solver, declared = default_solver(problem)
+        solver_params = {**declared, **(solver_params or {})}
+    x, stats = solve(rhs, x0, t, solver, solver_params, jac=jac, vectorized=vectorized)
+    return (x, stats) if full_output else x
+
+
+def default_params(problem):
+    """Default parameters of an ode generator."""
+    if isinstance(problem, ODE):
+        return dict(problem.params)
+    return {p.name: p.default for p in inspect.signature(problem).parameters.values()}
+
+
+@cached(cacheable=_deterministic)
+def generate_ode_ensemble(
+    problem,
+    x0,
+    t,
+    ode_params=None,
+    noise_amplitude=0,
+    noise_pdf=None,
+    noise_params=None,
+    noise_kind="additive",
+    diff_params=None,
+    seed=None,
+    dtype=None,
+    solver=None,
+    solver_params=None,
+    batch_size=None,
+):
+    """Generate a batch of trajectories and estimate their derivatives.
+
+    All trajectories are integrated together as one block diagonal system. The right hand side is
+    evaluated once per solver step for the whole batch and the solver is told about the banded
+    structure of the Jacobian, so the cost per step grows linearly with the number of trajectories.
+    Because step size control is shared by the whole batch, each trajectory agrees with a single
+    `generate_ode_data` run up to the solver tolerance. The fixed step ``rk4`` solver steps the
+    states of shape (arity, n_traj) directly. Large ensembles can be split into batches of
+    `batch_size` trajectories which are integrated one after the other. Batches of one trajectory
+    are integrated like in `generate_ode_data`. Problems whose trajectories need very different
+    step sizes, e.g. yeast_glycolysis, declare a smaller default batch size, see
+    `reg_bench.ode.solvers.declared_settings`.
+
+    Args:
+        problem: ode generator
+        x0: initial conditions, shape (n_traj, arity) or (arity,)
+        t: timestamps of the output
+        ode_params: kwargs for problem, either a dict of scalars or arrays of shape (n_traj,)
+            or a list of n_traj dicts
+        noise_kind: proportional or additive
+        noise_amplitude: noise amplitude
+        noise_pdf: function which generates noise
+        noise_params: kwargs passed to noise_pdf
+        diff_params: kwargs passed to derivative
+        seed: seed or `numpy.random.Generator` for the default noise pdf, noisy data is only
+            cached for integer seeds
+        dtype: dtype of the returned arrays, e.g. float32, all computations run in float64
+        solver: solver name, defaults to the solver declared by the problem, see `integrate_ode`
+        solver_params: kwargs for the solver, e.g. rtol and atol
+        batch_size: number of trajectories integrated together, defaults to the batch size
+            declared by the problem or all at once
+
+    Returns:
+        x, dx: trajectories and derivatives of shape (n_traj, n_t, arity)
+
+    """
+    ode_params = _stack_params(ode_params)
+    x0 = np.atleast_2d(x0)
+    n_traj = max([len(x0)] + [np.size(v) for v in ode_params.values()])
+    x0 = np.broadcast_to(x0, (n_traj, x0.shape[1]))
+    arity = x0.shape[1]
+
+    if solver is None:
+        solver, declared = default_solver(problem)
+        solver_params = {**declared, **(solver_params or {})}
+    ode_params = {k: _expand(v, n_traj) for k, v in ode_params.items()}
+    size = batch_size or declared_settings(problem).get("batch_size") or n_traj
+    batches = []
+    for start in range(0, n_traj, size):
+        b = slice(start, start + size)
+        params = {k: v[b] if np.ndim(v) else v for k, v in ode_params.items()}
+        batches.append(_integrate_batch(problem, x0[b], t, params, solver, solver_params))
+    x = np.concatenate(batches, axis=1)
 
     x = add_measurement_noise(
         x,
@@ -44,14 +308,77 @@ def generate_ode_data(
         noise_pdf=noise_pdf,
         noise_params=noise_params,
         noise_kind=noise_kind,
+        rng=seed,
     )
-    dx = derivative(t, x, **(diff_params or {}))
-    return x, dx
+    dx = estimate_derivative(t, x, diff_params)
+    shape = (len(t), n_traj, arity)
+    return _batch_major(x, shape, dtype), _batch_major(dx, shape, dtype)
+
+
+def _integrate_batch(problem, x0, t, ode_params, solver, solver_params):
+    """Integrate the trajectories starting at `x0` of shape (n_traj, arity) as one system.
+
+    Returns:
+        x of shape (n_t, n_traj * arity)
+
+    """
+    n_traj, arity = x0.shape
+    if n_traj == 1:
+        dy = problem(**{k: v[0] if np.ndim(v) else v for k, v in ode_params.items()})
+        x, _ = solve(dy, x0[0], t, solver, solver_params)
+        return x
+    dy = problem(**ode_params)
+
+    def batched_dy(y, t):
+        out = dy(y.reshape(n_traj, arity).T, t)
+        return np.stack(np.broadcast_arrays(*out), axis=1).ravel()
+
+    if solver == "rk4":
+        x, _ = solve(dy, x0.T, t, solver, solver_params)
+        return x.transpose(0, 2, 1).reshape(len(t), -1)
+    solver_params = {**_block_structure(solver, arity, n_traj), **(solver_params or {})}
+    x, _ = solve(batched_dy, x0.ravel(), t, solver, solver_params, vectorized=False)
+    return x
 
 
-def add_measurement_noise(x, noise_amplitude=0, noise_pdf=None, noise_params=None, noise_kind="additive"):
-    """Add measurement noise to a trajectory."""
-    noise_pdf = noise_pdf or np.random.normal
+def _block_structure(solver, arity, n_traj):
+    """Solver params describing the block diagonal Jacobian of an ensemble."""
+    if solver == "odeint":
+        return dict(ml=arity - 1, mu=arity - 1)
+    if solver == "LSODA":
+        return dict(lband=arity - 1, uband=arity - 1)
+    if solver in ("Radau", "BDF"):
+        import scipy.sparse
+
+        return dict(jac_sparsity=scipy.sparse.block_diag([np.ones((arity, arity))] * n_traj))
+    return {}
+
+
+def _stack_params(ode_params):
+    """Turn a list of parameter dicts into a dict of parameter arrays."""
+    if ode_params is None:
+        return {}
+    if isinstance(ode_params, dict):
+        return ode_params
+    keys = set(ode_params[0])
+    if any(set(p) != keys for p in ode_params):
+        raise ValueError("All parameter sets of an ensemble need the same keys.")
+    return {k: np.array([p[k] for p in ode_params]) for k in keys}
+
+
+def _expand(value, n_traj):
+    return np.broadcast_to(value, (n_traj,)) if np.ndim(value) else value
+
+
+def _batch_major(x, shape, dtype=None):
+    return np.ascontiguousarray(np.reshape(x, shape).transpose(1, 0, 2), dtype=dtype)
+
+
+def add_measurement_noise(
+    x, noise_amplitude=0, noise_pdf=None, noise_params=None, noise_kind="additive", rng=None
+):
+    """Add measurement noise to a trajectory, `rng` is a seed or generator for the default noise pdf."""
+    noise_pdf = noise_pdf or as_rng(rng).normal
     noise_params = noise_params or {}
 
     if noise_amplitude > 0:
@@ -1,10 +1,16 @@
 import functools
-import random
 
 import numpy as np
 
+from ..utils import as_rng
+
 
 class ODE:
+    # default solver, its kwargs and ensemble batch size, see `reg_bench.ode.solvers.declared_settings`
+    solver = None
+    solver_params = None
+    batch_size = None
+
     def ode(self, **params):
         raise NotImplementedError
 
@@ -12,11 +18,15 @@ class ODE:
     def params(self):
         raise NotImplementedError
 
-    def __call__(self):
-        return self.ode(**self.params)
+    def __call__(self, **params):
+        return self.ode(**{**self.params, **params})
 
 
 class yeast_glycolysis(ODE):
+    # the smallest step size differs by orders of magnitude between initial conditions, a batch
+    # would be integrated with the smallest one of all its trajectories
+    batch_size = 1
+
     def __init__(self):
         """As of doi:10.1371/journal.pone.0119821.t002 Table 2
         """
@@ -47,12 +57,22 @@ class yeast_glycolysis(ODE):
         self.range = [s1, s2, s3, s4, s5, s6, s6]
         self.sigma = [sig1, sig2, sig3, sig4, sig5, sig6, sig7]
 
-    def initial_conditions(self, noise=True, rng=random):
-        noise = int(noise)
-        return [
-            max(0, rng.uniform(up, low) + rng.gauss(0, sigma))
-            for (up, low), sigma in zip(self.range, self.sigma)
-        ]
+    def initial_conditions(self, noise=True, rng=None, n=None):
+        """Draw initial conditions uniformly from the ranges of Table 2, optionally with gaussian noise.
+
+        Args:
+            noise: add gaussian noise with the standard deviations of Table 2
+            rng: seed or `numpy.random.Generator`
+            n: number of initial conditions, one of shape (7,) if None else shape (n, 7)
+
+        """
+        rng = as_rng(rng)
+        size = (len(self.range),) if n is None else (n, len(self.range))
+        low, high = np.transpose(self.range)
+        x0 = rng.uniform(low, high, size=size)
+        if noise:
+            x0 += rng.normal(0, self.sigma, size=size)
+        return np.maximum(0, x0)
 
     @property
     def params(self):
@@ -82,7 +102,7 @@ class yeast_glycolysis(ODE):
         Biophys Chem 2003; 106: 179. doi: 10.1016/S0301-4622(03) 00191-1 PMID: 14556906
         """
         # @functools.wraps(self.ode)
-        def dy(y, t):
+        def dy(y, t, be=np):
             s1, s2, s3, s4, s5, s6, s7 = y
 
             h1 = 2.0 * k1 * s1 * s6 / (1.0 + (s6 / K1) ** q)
@@ -113,19 +133,19 @@ class double_pendulum(ODE):
         return p
 
     def ode(self, m, l, g):
-        def dy(y, t):
+        def dy(y, t, be=np):
             phi1, phi2, p1, p2 = y
             Dphi = phi1 - phi2
 
             temp = m * l ** 2
-            denom = 16.0 - 9 * np.cos(Dphi) ** 2
+            denom = 16.0 - 9 * be.cos(Dphi) ** 2
 
-            dphi1 = 6.0 / temp * (2.0 * p1 - 3.0 * np.cos(Dphi) * p2) / denom
-            dphi2 = 6.0 / temp * (2.0 * p2 - 3.0 * np.cos(Dphi) * p1) / denom
+            dphi1 = 6.0 / temp * (2.0 * p1 - 3.0 * be.cos(Dphi) * p2) / denom
+            dphi2 = 6.0 / temp * (2.0 * p2 - 3.0 * be.cos(Dphi) * p1) / denom
 
-            temp2 = dphi1 * dphi2 * np.sin(Dphi)
-            dp1 = -0.5 * temp * (temp2 + 3 * g / l * np.sin(phi1))
-            dp2 = -0.5 * temp * (-temp2 + g / l * np.sin(phi2))
+            temp2 = dphi1 * dphi2 * be.sin(Dphi)
+            dp1 = -0.5 * temp * (temp2 + 3 * g / l * be.sin(phi1))
+            dp2 = -0.5 * temp * (-temp2 + g / l * be.sin(phi2))
 
             return [dphi1, dphi2, dp1, dp2]
 
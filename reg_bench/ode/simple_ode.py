@@ -1,11 +1,12 @@
 import functools
-import inspect
-import sys
 
 import numpy as np
-from sklearn.datasets.base import Bunch
 
+from ..dataset import Dataset
+from ..utils import LazyDict
+from ..utils import make_getattr
 from ..utils import make_register
+from .integrate import default_params
 from .integrate import generate_ode_data
 
 
@@ -16,7 +17,7 @@ register_ode = make_register(all_ode)
 @register_ode(2, "linear", "polynomial")
 def harmonic_oscillator(omega=1.0):
     @functools.wraps(harmonic_oscillator)
-    def dy(y, t):
+    def dy(y, t, be=np):
         dy0 = y[1]
         dy1 = -omega ** 2 * y[0]
         return [dy0, dy1]
@@ -27,7 +28,7 @@ def harmonic_oscillator(omega=1.0):
 @register_ode(2, "polynomial")
 def anharmonic_oscillator(omega=1.0, c=1.0, l=1.0):
     @functools.wraps(anharmonic_oscillator)
-    def dy(y, t):
+    def dy(y, t, be=np):
         dy0 = y[1]
         dy1 = -omega ** 2 * y[0] - l * y[0] ** 2 - c * y[1]
         return [dy0, dy1]
@@ -38,7 +39,7 @@ def anharmonic_oscillator(omega=1.0, c=1.0, l=1.0):
 @register_ode(3, "polynomial")
 def lorenz(s=10.0, r=28.0, b=8.0 / 3.0):
     @functools.wraps(lorenz)
-    def dy(y, t):
+    def dy(y, t, be=np):
         dy0 = s * (y[1] - y[0])
         dy1 = r * y[0] - y[1] - y[0] * y[2]
         dy2 = y[0] * y[1] - b * y[2]
@@ -50,7 +51,7 @@ def lorenz(s=10.0, r=28.0, b=8.0 / 3.0):
 @register_ode(2, "polynomial")
 def van_der_pol(omega=1.0, a=0.1, b=0.01):
     @functools.wraps(van_der_pol)
-    def dy(y, t):
+    def dy(y, t, be=np):
         y0, y1 = y
         dy0 = y1
         dy1 = -omega ** 2 * y0 + a * y1 * (1 - b * y0 ** 2)
@@ -62,7 +63,7 @@ def van_der_pol(omega=1.0, a=0.1, b=0.01):
 @register_ode(2)
 def michaelis_menten(vmax=0.25, Km=0.1, rho=1.0):
     @functools.wraps(michaelis_menten)
-    def dy(y, t):
+    def dy(y, t, be=np):
         s, p = y
         dp = vmax * s ** rho / (Km + s ** rho)
         ds = -dp
@@ -74,7 +75,7 @@ def michaelis_menten(vmax=0.25, Km=0.1, rho=1.0):
 @register_ode(3, "polynomial")
 def rössler(a=0.15, b=0.20, c=10.0):
     @functools.wraps(rössler)
-    def dy_(state, t):
+    def dy_(state, t, be=np):
         x, y, z = state
         dx = -y - z
         dy = x + a * y
@@ -87,7 +88,7 @@ def rössler(a=0.15, b=0.20, c=10.0):
 @register_ode(2, "polynomial")
 def brusselator(a=1.0, b=3.0):
     @functools.wraps(brusselator)
-    def dy_(state, t):
+    def dy_(state, t, be=np):
         x, y = state
         dx = a + x ** 2 * y - (b + 1) * x
         dy = b * x - x ** 2 * y
@@ -99,10 +100,10 @@ def brusselator(a=1.0, b=3.0):
 @register_ode(2)
 def magnets(K=0.25):
     @functools.wraps(magnets)
-    def dy(state, t):
+    def dy(state, t, be=np):
         theta1, theta2 = state
-        dtheta1 = K * np.sin(theta1 - theta2) - np.sin(theta1)
-        dtheta2 = K * np.sin(theta2 - theta1) - np.sin(theta2)
+        dtheta1 = K * be.sin(theta1 - theta2) - be.sin(theta1)
+        dtheta2 = K * be.sin(theta2 - theta1) - be.sin(theta2)
         return dtheta1, dtheta2
 
     return dy
@@ -111,7 +112,7 @@ def magnets(K=0.25):
 @register_ode(2)
 def predator_prey(a=0.5, b=0.5):
     @functools.wraps(predator_prey)
-    def dy_(state, t):
+    def dy_(state, t, be=np):
         x, y = state
         dx = x * (b - x - y / (1.0 + x))
         dy = y * (x / (1 + x) - a * y)
@@ -123,7 +124,7 @@ def predator_prey(a=0.5, b=0.5):
 @register_ode(2)
 def bacterial_respiration(a=0.1, b=0.2, q=1.0):
     @functools.wraps(bacterial_respiration)
-    def dy_(state, t):
+    def dy_(state, t, be=np):
         x, y = state
         temp = x * y / (1 + q * x ** 2)
         dx = b - x - temp
@@ -136,10 +137,10 @@ def bacterial_respiration(a=0.1, b=0.2, q=1.0):
 @register_ode(2)
 def glider(d=1.0):
     @functools.wraps(glider)
-    def dy(state, t):
+    def dy(state, t, be=np):
         v, theta = state
-        dv = -np.sin(theta) - d * v ** 2
-        dtheta = -np.cos(theta) / v + v
+        dv = -be.sin(theta) - d * v ** 2
+        dtheta = -be.cos(theta) / v + v
         return dv, dtheta
 
     return dy
@@ -148,41 +149,54 @@ def glider(d=1.0):
 @register_ode(2)
 def shear_flow(a=0.3):
     @functools.wraps(shear_flow)
-    def dy(state, t):
+    def dy(state, t, be=np):
         theta, phi = state
-        dtheta = np.tan(phi) ** (-1) * np.cos(theta)
-        dphi = (np.cos(phi) ** 2 + a * np.sin(phi) ** 2) * np.sin(theta)
+        dtheta = be.tan(phi) ** (-1) * be.cos(theta)
+        dphi = (be.cos(phi) ** 2 + a * be.sin(phi) ** 2) * be.sin(theta)
         return dtheta, dphi
 
     return dy
 
 
-def make_bunch(data_config):
-    default_params = lambda: {
-        p.name: p.default for p in inspect.signature(data_config["problem"]).parameters.values()
-    }
-    data_config["ode_params"] = data_config.get("ode_params", default_params())
-    x, dx = generate_ode_data(**data_config)
-    return Bunch(data=x, target=dx, x0=data_config["x0"], params=data_config["ode_params"], t=data_config["t"])
+def make_bunch(data_config, instrument=False):
+    """Generate a data set as `reg_bench.dataset.Dataset`.
+
+    Args:
+        data_config: kwargs for `generate_ode_data`
+        instrument: True stores the instrumentation report of `generate_ode_data` as ``report``
+            in the data set, a callable is also called with it
+
+    With ``target="both"`` in `data_config` the exact derivative is stored as ``exact_target``.
+    With a list of ``diff_params`` the target is a dict of derivatives, one per configuration.
+
+    """
+    data_config["ode_params"] = data_config.get("ode_params", default_params(data_config["problem"]))
+    reports = []
+    x, dx, *exact = generate_ode_data(**data_config, callback=reports.append if instrument else None)
+    bunch = Dataset(x, dx, t=data_config["t"], x0=data_config["x0"], params=data_config["ode_params"])
+    if exact:
+        bunch.exact_target = exact[0]
+    if instrument:
+        bunch.report = reports[0]
+        if callable(instrument):
+            instrument(bunch.report)
+    return bunch
 
 
 def make_load(ode, t=np.linspace(0, 100, 10001, endpoint=True), x0=1):
     arity = all_ode[ode]["arity"]
     data_config = dict(problem=ode, x0=np.ones(arity) * x0, t=t)
 
-    def loader():
-        return make_bunch(data_config)
+    def loader(dtype=None, instrument=False, target="estimate"):
+        return make_bunch(dict(data_config, dtype=dtype, target=target), instrument=instrument)
 
     loader.__name__ = "load_" + all_ode[ode]["name"]
-
-    # register loader to the simple_ode module
-    caller = inspect.getframeinfo(inspect.stack()[1][0])  # find current_module by looking up caller in stack
-    name = inspect.getmodulename(caller.filename)
-    current_module = [mod for mname, mod in sys.modules.items() if name == mname.split(".")[-1]][0]
-    if loader.__name__ not in dir(current_module):
-        setattr(current_module, loader.__name__, loader)
-
     return loader
 
 
-all_loaders = {all_ode[ode]["name"]: make_load(ode) for ode in all_ode}
+_ode_by_name = {v["name"]: k for k, v in all_ode.items()}
+all_loaders = LazyDict(_ode_by_name, lambda name: make_load(_ode_by_name[name]))
+loaders_by_attr = LazyDict(
+    ["load_" + name for name in all_loaders], lambda attr: all_loaders[attr[len("load_") :]]
+)
+__getattr__ = make_getattr(__name__, loaders_by_attr)
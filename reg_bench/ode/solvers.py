@@ -0,0 +1,155 @@
+"""Numerical solvers for the ode problems.
+
+All solvers take a right hand side with the `scipy.integrate.odeint` signature ``(y, t)`` and
+return the trajectory on the output grid together with solver statistics.
+
+- ``odeint``: LSODA from ODEPACK via `scipy.integrate.odeint`, switches between Adams and BDF
+- ``RK23``, ``RK45``, ``DOP853``, ``Radau``, ``BDF``, ``LSODA``: `scipy.integrate.solve_ivp`
+- ``rk4``: classical fixed step Runge-Kutta on the output grid, optionally with ``substeps``
+  per output interval. The state may have any shape, e.g. (arity, n_traj) to step a whole
+  ensemble with one right hand side evaluation per stage.
+
+Problems declare their default solver with ``solver`` and ``solver_params`` in their
+`register_ode` metadata or as attributes of `ODE` subclasses, see `declared_settings`.
+"""
+import numpy as np
+
+from .not_so_simple_ode import ODE
+
+
+ivp_methods = ("RK23", "RK45", "DOP853", "Radau", "BDF", "LSODA")
+solvers = ("odeint", "rk4") + ivp_methods
+
+# solve_ivp defaults to much looser tolerances than odeint, keep the accuracy when switching
+ivp_tolerances = dict(rtol=1.49012e-8, atol=1.49012e-8)
+
+
+def default_solver(problem):
+    """Solver and solver params declared by a problem, odeint if it declares none.
+
+    No problem declares a default solver, odeint was the fastest on all of them. It is LSODA from
+    ODEPACK, which switches between Adams and BDF by itself. For 20 yeast_glycolysis trajectories
+    over t = 0..10 odeint took 0.54 s, the solve_ivp methods LSODA 5.2 s, BDF 19 s and Radau 35 s.
+    For lorenz odeint took 0.24 s and DOP853 2.8 s. The solve_ivp methods step in Python.
+    """
+    meta = declared_settings(problem)
+    return meta.get("solver") or "odeint", dict(meta.get("solver_params") or {})
+
+
+def declared_settings(problem):
+    """Integration settings declared by a problem: ``solver``, ``solver_params`` and ``batch_size``.
+
+    ``batch_size`` is the number of trajectories `reg_bench.ode.integrate.generate_ode_ensemble`
+    integrates together by default.
+    """
+    if isinstance(problem, ODE):
+        return dict(solver=problem.solver, solver_params=problem.solver_params, batch_size=problem.batch_size)
+    from .simple_ode import all_ode
+
+    return all_ode.get(problem, {})
+
+
+def solve(rhs, x0, t, solver="odeint", solver_params=None, jac=None, vectorized=True):
+    """Integrate `rhs` from `x0` over the output grid `t`.
+
+    Args:
+        rhs: right hand side ``rhs(y, t)``
+        x0: initial state
+        t: timestamps of the output
+        solver: name of the solver, one of `solvers`
+        solver_params: kwargs for the solver, e.g. rtol and atol
+        jac: Jacobian ``jac(y, t)``, used by odeint and the implicit solve_ivp methods
+        vectorized: whether `rhs` accepts states of shape (arity, k), lets the implicit
+            solve_ivp methods evaluate finite difference Jacobians in one call
+
+    Returns:
+        x, stats: trajectory and dict with the number of ``steps``, ``rhs_evaluations`` and
+        ``jacobian_evaluations``, the smallest and largest step size and the methods used, None
+        where the solver does not report them
+
+    """
+    solver_params = solver_params or {}
+    if solver == "odeint":
+        import scipy.integrate
+
+        x, info = scipy.integrate.odeint(rhs, x0, t, Dfun=jac, full_output=True, **solver_params)
+        return x, _odeint_stats(info)
+    if solver == "rk4":
+        return rk4(rhs, x0, t, **solver_params)
+    if solver in ivp_methods:
+        return _solve_ivp(rhs, x0, t, solver, solver_params, jac, vectorized)
+    raise ValueError("Unknown solver: {}".format(solver))
+
+
+def rk4(rhs, x0, t, substeps=1):
+    """Classical fourth order Runge-Kutta with `substeps` fixed steps per output interval."""
+    f = lambda y, s: _stack(rhs(y, s))
+    x = np.empty((len(t),) + np.shape(x0))
+    x[0] = x0
+    for i in range(len(t) - 1):
+        h = (t[i + 1] - t[i]) / substeps
+        y, s = x[i], t[i]
+        for _ in range(substeps):
+            k1 = f(y, s)
+            k2 = f(y + 0.5 * h * k1, s + 0.5 * h)
+            k3 = f(y + 0.5 * h * k2, s + 0.5 * h)
+            k4 = f(y + h * k3, s + h)
+            y = y + h / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+            s = s + h
+        x[i + 1] = y
+    steps = np.diff(t) / substeps
+    stats = dict(
+        steps=steps.size * substeps,
+        rhs_evaluations=4 * steps.size * substeps,
+        jacobian_evaluations=0,
+        min_step=float(steps.min()) if steps.size else None,
+        max_step=float(steps.max()) if steps.size else None,
+        methods=["rk4"],
+    )
+    return x, stats
+
+
+def _solve_ivp(rhs, x0, t, method, solver_params, jac, vectorized):
+    import scipy.integrate
+
+    options = {**ivp_tolerances, **solver_params}
+    if jac is not None and method in ("Radau", "BDF", "LSODA"):
+        options.setdefault("jac", lambda s, y: jac(y, s))
+    sol = scipy.integrate.solve_ivp(
+        lambda s, y: _stack(rhs(y, s)),
+        (t[0], t[-1]),
+        x0,
+        method=method,
+        t_eval=t,
+        vectorized=vectorized,
+        **options
+    )
+    if not sol.success:
+        raise RuntimeError("{} failed: {}".format(method, sol.message))
+    stats = dict(
+        steps=None,
+        rhs_evaluations=int(sol.nfev),
+        jacobian_evaluations=int(sol.njev),
+        min_step=None,
+        max_step=None,
+        methods=[method],
+    )
+    return sol.y.T, stats
+
+
+def _stack(out):
+    """Array of the right hand side components, constant components are broadcast."""
+    return np.stack(np.broadcast_arrays(*out))
+
+
+def _odeint_stats(info):
+    """Summarise the per output point diagnostics returned by ``odeint(full_output=True)``."""
+    steps = info["hu"][info["nst"] > 0]  # step sizes, zero before the first step
+    return dict(
+        steps=int(info["nst"][-1]),
+        rhs_evaluations=int(info["nfe"][-1]),
+        jacobian_evaluations=int(info["nje"][-1]),
+        min_step=float(steps.min()) if steps.size else None,
+        max_step=float(steps.max()) if steps.size else None,
+        methods=sorted({("adams", "bdf")[m - 1] for m in info["mused"] if m in (1, 2)}),
+    )
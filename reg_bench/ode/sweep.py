@@ -0,0 +1,87 @@
+"""Parameter sweeps.
+
+A sweep integrates an ode over the outer product of a grid of parameter values. All parameter
+sets are integrated together with `generate_ode_ensemble`, the right hand side is built once and
+evaluated on all of them per solver step. The result is labelled with the swept values::
+
+    sweep = generate_ode_sweep(lorenz, np.ones(3), t, dict(r=np.linspace(0, 50, 501)))
+    sweep.data.shape  # (501, len(t), 3), sweep.dims == ("r", "t", "state")
+    x, dx = select(sweep, r=28.0)  # x.shape == (len(t), 3)
+"""
+import numpy as np
+
+from ..dataset import Dataset
+from .integrate import generate_ode_ensemble
+
+
+def generate_ode_sweep(problem, x0, t, grid, ode_params=None, batch_size=None, **kwargs):
+    """Generate trajectories and derivatives for every point of a parameter grid.
+
+    Args:
+        problem: ode generator
+        x0: initial condition of shape (arity,) shared by all parameter sets, or of shape
+            (*grid shape, arity)
+        t: timestamps of the output
+        grid: dict mapping parameter names to 1d arrays of values, the sweep covers their outer
+            product in the order of the dict
+        ode_params: kwargs for problem which are not swept
+        batch_size: number of parameter sets integrated together, all at once by default
+        kwargs: passed to `generate_ode_ensemble`, e.g. noise, diff_params, solver and dtype
+
+    Returns:
+        `reg_bench.dataset.Dataset` with data and target of shape (*grid shape, n_t, arity), the swept
+        values ``coords``, the axis names ``dims``, ``t``, ``x0`` and the fixed ``params``
+
+    """
+    coords = {name: np.asarray(values, dtype=float) for name, values in grid.items()}
+    if any(values.ndim != 1 for values in coords.values()):
+        raise ValueError("The values of every swept parameter must be one dimensional.")
+    mesh = np.meshgrid(*coords.values(), indexing="ij")
+    shape = mesh[0].shape if mesh else ()
+    x0 = np.asarray(x0, dtype=float)
+    arity = x0.shape[-1]
+
+    swept = {name: m.ravel() for name, m in zip(coords, mesh)}
+    x, dx = generate_ode_ensemble(
+        problem,
+        np.broadcast_to(x0, shape + (arity,)).reshape(-1, arity),
+        t,
+        ode_params={**(ode_params or {}), **swept},
+        batch_size=batch_size,
+        **kwargs
+    )
+    return Dataset(
+        x.reshape(shape + x.shape[1:]),
+        dx.reshape(shape + dx.shape[1:]),
+        t=t,
+        x0=x0,
+        params=dict(ode_params or {}),
+        coords=coords,
+        dims=tuple(coords) + ("t", "state"),
+    )
+
+
+def select(sweep, **values):
+    """Select the trajectories of a sweep at the given parameter values.
+
+    Args:
+        sweep: output of `generate_ode_sweep`
+        values: swept parameter values, parameters which are not given are kept as axes
+
+    Returns:
+        data, target: arrays with the axes of the selected parameters removed
+
+    """
+    index = []
+    for name, coord in sweep.coords.items():
+        if name not in values:
+            index.append(slice(None))
+            continue
+        value = values.pop(name)
+        match = np.flatnonzero(np.isclose(coord, value))
+        if not match.size:
+            raise KeyError("{} is not a swept value of {}".format(value, name))
+        index.append(match[0])
+    if values:
+        raise KeyError("Not swept: {}".format(", ".join(values)))
+    return sweep.data[tuple(index)], sweep.target[tuple(index)]
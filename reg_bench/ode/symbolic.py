@@ -0,0 +1,95 @@
+"""Symbolic form of the ODE problems.
+
+Every right hand side takes the math module as keyword ``be``. Evaluating it on sympy symbols
+instead of arrays yields its symbolic form, from which analytic Jacobians and compiled callables
+for the solvers are derived. They are cached by the content of the problem and its parameters,
+so new instances of an `ODE` class reuse the compiled callables.
+"""
+from ..cache import memoize
+from .integrate import default_params
+
+
+@memoize()
+def symbolic_ode(problem, arity):
+    """Trace an ode generator with sympy symbols.
+
+    Args:
+        problem: ode generator
+        arity: number of state variables
+
+    Returns:
+        t, y, p, exprs: time, state and parameter symbols and the right hand side expressions
+
+    """
+    import sympy
+
+    t = sympy.Symbol("t", real=True)
+    y = sympy.symbols("y:{}".format(arity), real=True)
+    p = [sympy.Symbol(name, real=True) for name in default_params(problem)]
+    dy = problem(**{str(s): s for s in p})
+    exprs = [sympy.sympify(e) for e in dy(y, t, be=sympy)]
+    return t, y, p, exprs
+
+
+@memoize()
+def _numeric_ode(problem, arity, params):
+    t, y, p, exprs = symbolic_ode(problem, arity)
+    values = dict(params)
+    exprs = [e.subs({s: values[str(s)] for s in p}) for e in exprs]
+    return t, y, exprs
+
+
+def jacobian(problem, arity, ode_params=None):
+    """Analytic Jacobian of an ode generator.
+
+    Parameter values are substituted before differentiating, which keeps expressions like
+    ``(s / K) ** q`` regular at ``s = 0``.
+
+    Returns:
+        sympy.Matrix: derivatives of the right hand side (rows) by the states (columns)
+
+    """
+    import sympy
+
+    t, y, exprs = _numeric_ode(problem, arity, _params_key(problem, ode_params))
+    return sympy.Matrix(exprs).jacobian(y)
+
+
+@memoize()
+def _compile_ode(problem, arity, params):
+    import sympy
+
+    t, y, exprs = _numeric_ode(problem, arity, params)
+    rhs = sympy.lambdify((y, t), exprs, modules="numpy")
+    jac = sympy.lambdify((y, t), sympy.Matrix(exprs).jacobian(y), modules="numpy")
+    return rhs, jac
+
+
+def compile_ode(problem, arity, ode_params=None):
+    """Compile the right hand side and its analytic Jacobian.
+
+    Compiled callables are cached per problem and parameter set.
+
+    Returns:
+        rhs, jac: callables with the signature ``(y, t)`` as expected by `scipy.integrate.odeint`
+
+    """
+    return _compile_ode(problem, arity, _params_key(problem, ode_params))
+
+
+@memoize()
+def _pyodesys_ode(problem, arity, params):
+    from pyodesys.symbolic import SymbolicSys
+
+    t, y, exprs = _numeric_ode(problem, arity, params)
+    return SymbolicSys(list(zip(y, exprs)), t)
+
+
+def pyodesys_ode(problem, arity, ode_params=None):
+    """Build a `pyodesys.symbolic.SymbolicSys` with analytic Jacobian for an ode generator."""
+    return _pyodesys_ode(problem, arity, _params_key(problem, ode_params))
+
+
+def _params_key(problem, ode_params):
+    params = {**default_params(problem), **(ode_params or {})}
+    return tuple(sorted((k, float(v)) for k, v in params.items()))
@@ -0,0 +1,120 @@
+"""Windowed generation of very long trajectories.
+
+The trajectory is integrated window by window, each window continues from the last state of the
+previous one. Noise is added per window and the derivative of a window is estimated on the window
+extended by `overlap` samples on both sides, so local differentiation methods give the same result
+as differentiating the whole trajectory at once.
+"""
+import pathlib
+
+import numpy as np
+
+from ..utils import as_dtype
+from ..utils import as_rng
+from .integrate import add_measurement_noise
+from .integrate import estimate_derivative
+from .integrate import integrate_ode
+
+
+def iterate_ode_data(
+    problem,
+    x0,
+    t,
+    ode_params=None,
+    noise_amplitude=0,
+    noise_pdf=None,
+    noise_params=None,
+    noise_kind="additive",
+    diff_params=None,
+    backend="python",
+    seed=None,
+    window=2 ** 16,
+    overlap=128,
+    dtype=None,
+    solver=None,
+    solver_params=None,
+):
+    """Generate a trajectory and its derivative in windows.
+
+    Arguments are the same as for `generate_ode_data`.
+
+    Args:
+        window: number of samples integrated at once
+        overlap: number of samples on each side of a window used for the derivative estimate
+        dtype: dtype of the returned chunks, all computations run in float64
+
+    Yields:
+        t, x, dx: chunks of at most `window` samples
+
+    """
+    if overlap > window:
+        raise ValueError("The overlap must not be larger than the window.")
+    noise_pdf = noise_pdf or as_rng(seed).normal
+
+    blocks = (
+        (t_, add_measurement_noise(x_, noise_amplitude, noise_pdf, noise_params, noise_kind))
+        for t_, x_ in _integrate_windows(problem, x0, t, window, ode_params, backend, solver, solver_params)
+    )
+    left_t, left_x = t[:0], np.empty((0, len(x0)))
+    pending = next(blocks, None)
+    if pending is None:
+        return
+    for block in blocks:
+        right = block[0][:overlap], block[1][:overlap]
+        yield _differentiate(pending, (left_t, left_x), right, diff_params, dtype)
+        left_t = _last(np.concatenate([left_t, pending[0]]), overlap)
+        left_x = _last(np.concatenate([left_x, pending[1]]), overlap)
+        pending = block
+    yield _differentiate(pending, (left_t, left_x), (t[:0], left_x[:0]), diff_params, dtype)
+
+
+def _last(array, n):
+    # array[-n:] would keep the whole array for n = 0
+    return array[len(array) - n :]
+
+
+def generate_ode_memmap(path, problem, x0, t, **kwargs):
+    """Generate a trajectory and its derivative into memory-mapped ``x.npy`` and ``dx.npy`` files.
+
+    Args:
+        path: output directory
+        kwargs: passed to `iterate_ode_data`
+
+    Returns:
+        x, dx: read-only memory maps
+
+    """
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    shape, dtype = (len(t), len(x0)), kwargs.get("dtype") or float
+    x = np.lib.format.open_memmap(str(path / "x.npy"), mode="w+", dtype=dtype, shape=shape)
+    dx = np.lib.format.open_memmap(str(path / "dx.npy"), mode="w+", dtype=dtype, shape=shape)
+    start = 0
+    for _, x_, dx_ in iterate_ode_data(problem, x0, t, **kwargs):
+        x[start : start + len(x_)] = x_
+        dx[start : start + len(x_)] = dx_
+        start += len(x_)
+    x.flush()
+    dx.flush()
+    del x, dx
+    return np.load(str(path / "x.npy"), mmap_mode="r"), np.load(str(path / "dx.npy"), mmap_mode="r")
+
+
+def _integrate_windows(problem, x0, t, window, ode_params, backend, solver, solver_params):
+    """Integrate window by window, continuing from the last state of the previous window."""
+    kwargs = dict(ode_params=ode_params, backend=backend, solver=solver, solver_params=solver_params)
+    state = x0
+    for start in range(0, len(t), window):
+        if start == 0:
+            x = integrate_ode(problem, state, t[:window], **kwargs)
+        else:
+            x = integrate_ode(problem, state, t[start - 1 : start + window], **kwargs)[1:]
+        state = x[-1]
+        yield t[start : start + window], x
+
+
+def _differentiate(block, left, right, diff_params, dtype):
+    t = np.concatenate([left[0], block[0], right[0]])
+    x = np.concatenate([left[1], block[1], right[1]])
+    dx = estimate_derivative(t, x, diff_params)[len(left[0]) : len(left[0]) + len(block[0])]
+    return block[0], as_dtype(block[1], dtype), as_dtype(dx, dtype)
@@ -0,0 +1,99 @@
+"""Generate the whole benchmark suite in parallel.
+
+Every task draws from its own random stream which is derived from the master seed and the name of
+the task. Results are therefore identical whatever the number of workers or the order in which the
+tasks complete.
+"""
+import concurrent.futures
+import hashlib
+import inspect
+
+import numpy as np
+
+
+families = ("ode", "map", "sr")
+
+map_steps = 1000
+map_x0 = 0.1
+
+
+def _registry(family):
+    if family == "ode":
+        from .ode import all_loaders
+
+        return all_loaders
+    if family == "map":
+        from .maps import all_maps
+
+        return {v["name"]: k for k, v in all_maps.items() if _has_defaults(k)}
+    if family == "sr":
+        from .symbolic_regression import all_problems
+
+        return all_problems
+    raise ValueError("Unknown problem family: {}".format(family))
+
+
+def _has_defaults(func):
+    return all(p.default is not p.empty for p in inspect.signature(func).parameters.values())
+
+
+def tasks(families=families, names=None):
+    """List all (family, name) tasks of the suite, optionally restricted to the given names."""
+    return [
+        (family, name) for family in families for name in _registry(family) if names is None or name in names
+    ]
+
+
+def task_seed(seed, family, name):
+    """Seed of the random stream of a single task derived from the master seed."""
+    digest = hashlib.sha256("{}:{}:{}".format(seed, family, name).encode()).digest()
+    return int.from_bytes(digest[:4], "little")
+
+
+def run_task(family, name, seed=0):
+    """Generate the data set of a single task.
+
+    Returns:
+        a `reg_bench.dataset.Dataset` for ode and map problems and the (train, test) pair of data
+        sets for symbolic regression problems
+
+    """
+    problem = _registry(family)[name]
+    rng = np.random.default_rng(task_seed(seed, family, name))
+    if family == "ode":
+        return problem()
+    if family == "map":
+        from .maps import all_maps
+        from .maps import generate_map_data
+
+        x0 = np.full(all_maps[problem]["arity"], map_x0) if all_maps[problem]["arity"] > 1 else map_x0
+        return generate_map_data(problem, x0, map_steps)
+    if "rng" in inspect.signature(problem).parameters:
+        return problem(rng=rng)
+    return problem()
+
+
+def generate_suite(seed=0, n_jobs=None, families=families, names=None):
+    """Generate all problems of the suite in a process pool.
+
+    Args:
+        seed: master seed from which the random stream of every task is derived
+        n_jobs: number of worker processes, defaults to the number of cpus, 1 runs in process
+        families: problem families to generate, any of ode, map and sr
+        names: only generate problems with these names
+
+    Yields:
+        family, name, result: as soon as a task finishes, see `run_task`
+
+    """
+    todo = tasks(families, names)
+    if n_jobs == 1:
+        for family, name in todo:
+            yield family, name, run_task(family, name, seed)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        futures = {executor.submit(run_task, family, name, seed): (family, name) for family, name in todo}
+        for future in concurrent.futures.as_completed(futures):
+            family, name = futures[future]
+            yield family, name, future.result()
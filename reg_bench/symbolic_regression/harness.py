@@ -0,0 +1,170 @@
+"""Evaluation of regression models on all symbolic regression problems.
+
+The train/test pairs are generated once and packed into a `reg_bench.catalog` file which the worker
+processes memory-map, so no worker regenerates or copies a data set. Every (model, problem) pair
+is fitted and scored in its own task::
+
+    from sklearn.linear_model import LinearRegression
+    results = evaluate(dict(linear=LinearRegression()), n_jobs=4)
+    write_leaderboard(results, "leaderboard.csv")
+
+A model is either an estimator with ``fit(X, y)`` and ``predict(X)``, which is cloned for every
+problem, or a callable ``fit(X, y)`` returning a callable ``predict(X)``. Inputs have shape
+(n_points, n_features). Points whose target is not finite, e.g. outside the domain of a logarithm,
+are neither trained on nor scored.
+"""
+import concurrent.futures
+import copy
+import csv
+import pathlib
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from .. import catalog
+
+
+columns = ("model", "problem", "fit_time", "predict_time", "memory", "rmse", "nrmse", "error")
+
+
+def evaluate(models, names=None, n_jobs=None, seed=0, path=None):
+    """Fit and score models on the symbolic regression problems.
+
+    Args:
+        models: dict mapping names to models or a single model, see the module docstring, models
+            must be picklable unless `n_jobs` is 1
+        names: names of the problems, all by default
+        n_jobs: number of worker processes, defaults to the number of cpus, 1 runs in process
+        seed: master seed of the suite, only used if `path` is None
+        path: existing catalog with the symbolic regression problems, one with the problems in
+            `names` is built in a temporary directory by default
+
+    Returns:
+        list of dicts with the `columns` of every (model, problem) pair: fit and predict time in
+        seconds, peak memory in bytes allocated during fit and predict or None if it could not be
+        traced, root mean squared test error, the same normalised by the standard deviation of the
+        test targets and the error message if the model failed
+
+    """
+    if not isinstance(models, dict):
+        models = {_name(models): models}
+    with tempfile.TemporaryDirectory() as tmp:
+        if path is None:
+            path = pathlib.Path(tmp) / "sr.bin"
+            catalog.build_catalog(path, seed=seed, n_jobs=n_jobs, families=("sr",), names=names)
+        problems = names or [p["name"] for p in catalog.read_index(path)["problems"].values()]
+        todo = [(m, p) for m in models for p in problems]
+        if n_jobs == 1:
+            return [score(models[m], p, path, model_name=m) for m, p in todo]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(score, models[m], p, str(path), model_name=m) for m, p in todo]
+            return [future.result() for future in futures]
+
+
+def score(model, problem, path=None, model_name=None, seed=None):
+    """Fit and score a model on one problem of a catalog, see `evaluate`.
+
+    The problem is read from the catalog at `path` or from the default catalog of `seed`, 0 by
+    default. Passing both raises a ValueError as the catalog at `path` has its own seed.
+
+    Memory is traced with `tracemalloc`. If the caller is already tracing, the trace is kept
+    running and its peak is reset, before Python 3.9 the memory is not recorded in that case.
+    """
+    if path is not None and seed is not None:
+        raise ValueError("Pass either the path or the seed of a catalog, not both")
+    train, test = catalog.lookup("sr", problem, path=path, seed=seed or 0)
+    row = dict({k: None for k in columns}, model=model_name or _name(model), problem=problem)
+    owner = not tracemalloc.is_tracing()  # a trace started by the caller is left running
+    if owner:
+        tracemalloc.start()
+    elif hasattr(tracemalloc, "reset_peak"):  # Python 3.9
+        tracemalloc.reset_peak()
+    traced = tracemalloc.get_traced_memory()[0]
+    measured = owner or hasattr(tracemalloc, "reset_peak")
+    try:
+        start = time.perf_counter()
+        predict = _fit(model, *_finite(*train.Xy()))
+        row["fit_time"] = time.perf_counter() - start
+        x, y = test.Xy()
+        start = time.perf_counter()
+        prediction = np.asarray(predict(x), dtype=float).ravel()
+        row["predict_time"] = time.perf_counter() - start
+        row["memory"] = tracemalloc.get_traced_memory()[1] - traced if measured else None
+    except Exception as e:  # a failing model is recorded, not fatal for the whole evaluation
+        row["error"] = "{}: {}".format(type(e).__name__, e)
+        return row
+    finally:
+        if owner:
+            tracemalloc.stop()
+
+    finite = np.isfinite(y)
+    residual = prediction[finite] - y[finite]
+    row["rmse"] = float(np.sqrt(np.mean(residual ** 2)))
+    row["nrmse"] = row["rmse"] / float(np.std(y[finite])) if np.std(y[finite]) > 0 else None
+    return row
+
+
+def leaderboard(results):
+    """Aggregate the results per model, ordered by median normalised test error.
+
+    Returns:
+        list of dicts with the model name, number of problems, failures, median and mean normalised
+        error and total fit and predict time
+
+    """
+    rows = []
+    for model in dict.fromkeys(r["model"] for r in results):
+        runs = [r for r in results if r["model"] == model]
+        nrmse = [r["nrmse"] for r in runs if r["nrmse"] is not None and np.isfinite(r["nrmse"])]
+        rows.append(
+            dict(
+                model=model,
+                problems=len(runs),
+                failures=sum(r["error"] is not None for r in runs),
+                median_nrmse=float(np.median(nrmse)) if nrmse else None,
+                mean_nrmse=float(np.mean(nrmse)) if nrmse else None,
+                fit_time=sum(r["fit_time"] or 0 for r in runs),
+                predict_time=sum(r["predict_time"] or 0 for r in runs),
+            )
+        )
+    return sorted(rows, key=lambda r: np.inf if r["median_nrmse"] is None else r["median_nrmse"])
+
+
+def write_leaderboard(results, path):
+    """Write the per problem results and the leaderboard of `leaderboard` as CSV files.
+
+    The results are written to `path`, the leaderboard next to it with the suffix ``.leaderboard``.
+    """
+    board = leaderboard(results)
+    for rows, fields, filename in (
+        (results, columns, str(path)),
+        (board, list(board[0]) if board else [], "{}.leaderboard".format(path)),
+    ):
+        with open(filename, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    return board
+
+
+def _finite(x, y):
+    finite = np.isfinite(y)
+    return (x, y) if finite.all() else (x[finite], y[finite])
+
+
+def _fit(model, x, y):
+    if hasattr(model, "fit") and hasattr(model, "predict"):
+        try:
+            from sklearn.base import clone
+
+            model = clone(model)
+        except (ImportError, TypeError):
+            model = copy.deepcopy(model)
+        return model.fit(x, y).predict
+    return model(x, y)
+
+
+def _name(model):
+    return getattr(model, "__name__", type(model).__name__)
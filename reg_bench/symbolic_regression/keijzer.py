@@ -1,11 +1,12 @@
-import sys
 from functools import partial
 
 import numpy as np
 
+from ..utils import as_rng
+from ..utils import make_getattr
 from .util import generate_evenly_spaced_data_set
 from .util import generate_uniform_data_set
-from .util import generator_from_helper
+from .util import generators_from_helper
 
 """
 Sets of "Improving Symbolic Regression with Interval Arithmetic and Linear Scaling" by Maarten Keijzer
@@ -28,13 +29,24 @@ def keijzer_func6(x, y, z):
 
 
 def keijzer_func7(x):
-    f = lambda n: sum(1.0 / i for i in range(1, int(n)))
-    if any(x < 0):
+    """Harmonic number sum(1 / i for i in range(1, int(x))) looked up in a cumulative table."""
+    x = np.asarray(x)
+    if np.any(x < 0):
         raise ValueError
-    if isinstance(x, np.ndarray):
-        return np.array([f(n) for n in x])
-    else:
-        return f(x)
+    n = np.maximum(x.astype(int) - 1, 0)
+    return _harmonic_numbers(int(n.max(initial=0)))[n]
+
+
+_harmonic_table = np.zeros(1)
+
+
+def _harmonic_numbers(n):
+    """Table of the harmonic numbers H_0 ... H_n, grown on demand."""
+    global _harmonic_table
+    if len(_harmonic_table) <= n:
+        size = max(n + 1, 2 * len(_harmonic_table))
+        _harmonic_table = np.concatenate([[0.0], np.cumsum(1.0 / np.arange(1, size))])
+    return _harmonic_table
 
 
 def keijzer_func8(x):
@@ -73,81 +85,82 @@ def keijzer_func16(x, y):
     return x ** 3 / 3.0 + y ** 3 / 2.0 - y - x
 
 
-def _keijzer1_3_helper(step, ranges):
-    return generate_evenly_spaced_data_set(keijzer_func4, step, ranges)
+def _keijzer1_3_helper(step, ranges, dtype=None):
+    return generate_evenly_spaced_data_set(keijzer_func4, step, ranges, dtype=dtype)
 
 
-def generate_keijzer1():
+def generate_keijzer1(dtype=None):
     ranges = (-1, 1)
-    train = _keijzer1_3_helper(0.1, ranges)
-    test = _keijzer1_3_helper(0.001, ranges)
+    train = _keijzer1_3_helper(0.1, ranges, dtype=dtype)
+    test = _keijzer1_3_helper(0.001, ranges, dtype=dtype)
     return train, test
 
 
-def generate_keijzer2():
+def generate_keijzer2(dtype=None):
     ranges = (-2, 2)
-    train = _keijzer1_3_helper(0.1, ranges)
-    test = _keijzer1_3_helper(0.001, ranges)
+    train = _keijzer1_3_helper(0.1, ranges, dtype=dtype)
+    test = _keijzer1_3_helper(0.001, ranges, dtype=dtype)
     return train, test
 
 
-def generate_keijzer3():
+def generate_keijzer3(dtype=None):
     ranges = (-4, 4)
-    train = _keijzer1_3_helper(0.1, ranges)
-    test = _keijzer1_3_helper(0.001, ranges)
+    train = _keijzer1_3_helper(0.1, ranges, dtype=dtype)
+    test = _keijzer1_3_helper(0.001, ranges, dtype=dtype)
     return train, test
 
 
-def generate_keijzer4():
-    train = generate_evenly_spaced_data_set(keijzer_func5, 0.05, (0, 10))
-    test = generate_evenly_spaced_data_set(keijzer_func5, 0.05, (0.05, 10.05))
+def generate_keijzer4(dtype=None):
+    train = generate_evenly_spaced_data_set(keijzer_func5, 0.05, (0, 10), dtype=dtype)
+    test = generate_evenly_spaced_data_set(keijzer_func5, 0.05, (0.05, 10.05), dtype=dtype)
     return train, test
 
 
-def generate_keijzer5(rng=np.random):
+def generate_keijzer5(rng=None, dtype=None):
     ranges = [(-1, 1), (1, 2), (-1, 1)]
-    train = generate_uniform_data_set(keijzer_func6, 1000, ranges, rng=rng)
-    test = generate_uniform_data_set(keijzer_func6, 10000, ranges, rng=rng)
+    rng = as_rng(rng)
+    train = generate_uniform_data_set(keijzer_func6, 1000, ranges, rng=rng, dtype=dtype)
+    test = generate_uniform_data_set(keijzer_func6, 10000, ranges, rng=rng, dtype=dtype)
     return train, test
 
 
-def generate_keijzer6():
-    train = generate_evenly_spaced_data_set(keijzer_func7, 1.0, (1, 50))
-    test = generate_evenly_spaced_data_set(keijzer_func7, 1.0, (1, 120))
+def generate_keijzer6(dtype=None):
+    train = generate_evenly_spaced_data_set(keijzer_func7, 1.0, (1, 50), dtype=dtype)
+    test = generate_evenly_spaced_data_set(keijzer_func7, 1.0, (1, 120), dtype=dtype)
     return train, test
 
 
-def generate_keijzer7():
-    train = generate_evenly_spaced_data_set(keijzer_func8, 1.0, (1, 100))
-    test = generate_evenly_spaced_data_set(keijzer_func8, 0.01, (1, 100))
+def generate_keijzer7(dtype=None):
+    train = generate_evenly_spaced_data_set(keijzer_func8, 1.0, (1, 100), dtype=dtype)
+    test = generate_evenly_spaced_data_set(keijzer_func8, 0.01, (1, 100), dtype=dtype)
     return train, test
 
 
-def generate_keijzer8():
-    train = generate_evenly_spaced_data_set(keijzer_func9, 1.0, (0, 100))
-    test = generate_evenly_spaced_data_set(keijzer_func9, 0.01, (0, 100))
+def generate_keijzer8(dtype=None):
+    train = generate_evenly_spaced_data_set(keijzer_func9, 1.0, (0, 100), dtype=dtype)
+    test = generate_evenly_spaced_data_set(keijzer_func9, 0.01, (0, 100), dtype=dtype)
     return train, test
 
 
-def generate_keijzer9():
-    train = generate_evenly_spaced_data_set(keijzer_func10, 1.0, (0, 100))
-    test = generate_evenly_spaced_data_set(keijzer_func10, 0.01, (0, 100))
+def generate_keijzer9(dtype=None):
+    train = generate_evenly_spaced_data_set(keijzer_func10, 1.0, (0, 100), dtype=dtype)
+    test = generate_evenly_spaced_data_set(keijzer_func10, 0.01, (0, 100), dtype=dtype)
     return train, test
 
 
-def generate_keijzer10(rng=np.random):
-    train = generate_uniform_data_set(keijzer_func11, 100, (0, 1), rng=rng)
-    test = generate_evenly_spaced_data_set(keijzer_func11, 0.01, (0, 1))
+def generate_keijzer10(rng=None, dtype=None):
+    train = generate_uniform_data_set(keijzer_func11, 100, (0, 1), rng=rng, dtype=dtype)
+    test = generate_evenly_spaced_data_set(keijzer_func11, 0.01, (0, 1), dtype=dtype)
     return train, test
 
 
-def _keijzer11_15_helper(func, rng=np.random):
-    train = generate_uniform_data_set(func, 20, (-3, 3), rng=rng)
-    test = generate_evenly_spaced_data_set(func, 0.01, (-3, 3))
+def _keijzer11_15_helper(func, rng=None, dtype=None):
+    train = generate_uniform_data_set(func, 20, (-3, 3), rng=rng, dtype=dtype)
+    test = generate_evenly_spaced_data_set(func, 0.01, (-3, 3), dtype=dtype)
     return train, test
 
 
-generator_from_helper(_keijzer11_15_helper, shift=-1, i=list(range(12, 16)))
+_generators = generators_from_helper(_keijzer11_15_helper, globals(), shift=-1, i=list(range(12, 16)))
 
-current_module = sys.modules[__name__]
-all_problems = {name: getattr(current_module, name) for name in locals() if "generate_keijzer" in name}
+__getattr__ = make_getattr(__name__, _generators)
+all_problems = {name: f for name, f in {**globals(), **_generators}.items() if "generate_keijzer" in name}
@@ -1,11 +1,11 @@
-import sys
 from functools import partial
 
 import numpy as np
 
+from ..utils import as_rng
+from ..utils import make_getattr
 from .util import generate_uniform_data_set
-from .util import generator_from_helper
-
+from .util import generators_from_helper
 
 """
 Sets of "Accuracy in Symbolic Regression" by Korns
@@ -73,12 +73,13 @@ def korns_func15(x0, x1, x2, x3, x4):
     return 12.0 - 6.0 * np.tan(x0) / np.exp(x1) * (np.log(x2) - np.tan(x3))
 
 
-def _korns_helper(func, rng=np.random):
-    train = generate_uniform_data_set(func, 1000, (-50, 50), rng=rng)
-    test = generate_uniform_data_set(func, 1000, (-50, 50), rng=rng)
+def _korns_helper(func, rng=None, dtype=None):
+    rng = as_rng(rng)
+    train = generate_uniform_data_set(func, 1000, (-50, 50), rng=rng, dtype=dtype)
+    test = generate_uniform_data_set(func, 1000, (-50, 50), rng=rng, dtype=dtype)
     return train, test
 
 
-generator_from_helper(_korns_helper)
-current_module = sys.modules[__name__]
-all_problems = {name: getattr(current_module, name) for name in locals() if "generate_korns" in name}
+_generators = generators_from_helper(_korns_helper, globals())
+__getattr__ = make_getattr(__name__, _generators)
+all_problems = {name: f for name, f in {**globals(), **_generators}.items() if "generate_korns" in name}
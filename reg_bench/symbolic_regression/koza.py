@@ -1,13 +1,13 @@
-import sys
 from functools import partial
 
 import numpy as np
 
+from ..utils import as_rng
+from ..utils import make_getattr
 from .util import generate_uniform_data_set
-from .util import generator_from_helper
+from .util import generators_from_helper
 from .util import poly
 
-
 koza_func1 = partial(poly, i=4)
 
 
@@ -19,12 +19,13 @@ def koza_func3(x):
     return x ** 6 - 2.0 * x ** 4 + x ** 2
 
 
-def _koza_helper(func, rng=np.random):
-    train = generate_uniform_data_set(func, 20, (-1, 1), rng=rng)
-    test = generate_uniform_data_set(func, 20, (-1, 1), rng=rng)
+def _koza_helper(func, rng=None, dtype=None):
+    rng = as_rng(rng)
+    train = generate_uniform_data_set(func, 20, (-1, 1), rng=rng, dtype=dtype)
+    test = generate_uniform_data_set(func, 20, (-1, 1), rng=rng, dtype=dtype)
     return train, test
 
 
-generator_from_helper(_koza_helper)
-current_module = sys.modules[__name__]
-all_problems = {name: getattr(current_module, name) for name in locals() if "generate_koza" in name}
+_generators = generators_from_helper(_koza_helper, globals())
+__getattr__ = make_getattr(__name__, _generators)
+all_problems = {name: f for name, f in {**globals(), **_generators}.items() if "generate_koza" in name}
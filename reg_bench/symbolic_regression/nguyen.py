@@ -1,14 +1,14 @@
-import sys
 from functools import partial
 
 import numpy as np
 
+from ..utils import as_rng
+from ..utils import make_getattr
 from .util import generate_evenly_spaced_data_set
 from .util import generate_uniform_data_set
-from .util import generator_from_helper
+from .util import generators_from_helper
 from .util import poly
 
-
 nguyen_func1 = partial(poly, i=3)
 nguyen_func3 = partial(poly, i=5)
 nguyen_func4 = partial(poly, i=6)
@@ -38,34 +38,38 @@ def nguyen_func10(x, y):
     return 2.0 * np.sin(x) * np.cos(y)
 
 
-def _nguyen1_6_helper(func, rng=np.random):
-    train = generate_uniform_data_set(func, 20, (-1, 1), rng=rng)
-    test = generate_uniform_data_set(func, 20, (-1, 1), rng=rng)
+def _nguyen1_6_helper(func, rng=None, dtype=None):
+    rng = as_rng(rng)
+    train = generate_uniform_data_set(func, 20, (-1, 1), rng=rng, dtype=dtype)
+    test = generate_uniform_data_set(func, 20, (-1, 1), rng=rng, dtype=dtype)
     return train, test
 
 
-generator_from_helper(_nguyen1_6_helper, i=(1, 3, 4, 5, 6))
+_generators = generators_from_helper(_nguyen1_6_helper, globals(), i=(1, 3, 4, 5, 6))
 
 
-def generate_nguyen7(rng=np.random):
-    train = generate_uniform_data_set(nguyen_func7, 20, (0, 2), rng=rng)
-    test = generate_uniform_data_set(nguyen_func7, 20, (0, 2), rng=rng)
+def generate_nguyen7(rng=None, dtype=None):
+    rng = as_rng(rng)
+    train = generate_uniform_data_set(nguyen_func7, 20, (0, 2), rng=rng, dtype=dtype)
+    test = generate_uniform_data_set(nguyen_func7, 20, (0, 2), rng=rng, dtype=dtype)
     return train, test
 
 
-def generate_nguyen8(rng=np.random):
-    train = generate_uniform_data_set(nguyen_func8, 20, (0, 4), rng=rng)
-    test = generate_uniform_data_set(nguyen_func8, 20, (0, 4), rng=rng)
+def generate_nguyen8(rng=None, dtype=None):
+    rng = as_rng(rng)
+    train = generate_uniform_data_set(nguyen_func8, 20, (0, 4), rng=rng, dtype=dtype)
+    test = generate_uniform_data_set(nguyen_func8, 20, (0, 4), rng=rng, dtype=dtype)
     return train, test
 
 
-def _nguyen9_10_helper(func, rng=np.random):
-    train = generate_uniform_data_set(func, 100, (-1, 1), rng=rng)
-    test = generate_uniform_data_set(func, 100, (-1, 1), rng=rng)
+def _nguyen9_10_helper(func, rng=None, dtype=None):
+    rng = as_rng(rng)
+    train = generate_uniform_data_set(func, 100, (-1, 1), rng=rng, dtype=dtype)
+    test = generate_uniform_data_set(func, 100, (-1, 1), rng=rng, dtype=dtype)
     return train, test
 
 
-generator_from_helper(_nguyen9_10_helper, i=(9, 10))
+_generators.update(generators_from_helper(_nguyen9_10_helper, globals(), i=(9, 10)))
 
-current_module = sys.modules[__name__]
-all_problems = {name: getattr(current_module, name) for name in locals() if "generate_nguyen" in name}
+__getattr__ = make_getattr(__name__, _generators)
+all_problems = {name: f for name, f in {**globals(), **_generators}.items() if "generate_nguyen" in name}
@@ -1,26 +1,39 @@
-import collections
+import functools
 import inspect
-import sys
+import pathlib
 from functools import partial
-from inspect import getframeinfo
-from inspect import getmodulename
-from inspect import stack
 from itertools import repeat
 
 import numpy as np
 import toolz
 
+from ..cache import cached
+from ..dataset import Dataset
+from ..utils import as_dtype
+from ..utils import as_rng
+
 
 def poly(x, i):
-    return np.sum(x ** j for j in range(1, i + 1))
+    """x + x ** 2 + ... + x ** i evaluated with Horner's scheme."""
+    y = x
+    for _ in range(i - 1):
+        y = x * (1.0 + y)
+    return y
+
+
+# data sets used to be namedtuples of inputs of shape (dim, n_points) and targets
+TestData = test_data = Dataset
 
 
-test_data = collections.namedtuple("TestData", "data target")
+@functools.lru_cache(maxsize=None)
+def arity(testfunction):
+    """Number of positional arguments of a test function."""
+    return len(inspect.getfullargspec(testfunction).args)
 
 
-def generate_data_set(testfunction, num_points, dist, params):
+def generate_data_set(testfunction, num_points, dist, params, dtype=None):
 
-    dim = len(inspect.getfullargspec(testfunction).args)
+    dim = arity(testfunction)
 
     if isinstance(params, dict):
         dist_ = lambda size, params: dist(size=size, **params)
@@ -29,7 +42,7 @@ def generate_data_set(testfunction, num_points, dist, params):
 
     data = dist_(size=(dim, num_points), params=params)
     target = testfunction(*data)
-    return test_data(data=data, target=target)
+    return test_data(data=as_dtype(data, dtype).T, target=as_dtype(target, dtype))
 
 
 def nd_dist_factory(dist):
@@ -38,10 +51,10 @@ def nd_dist_factory(dist):
     )
 
 
-def generate_uniform_data_set(testfunction, num_points, ranges, rng=np.random):
+def generate_uniform_data_set(testfunction, num_points, ranges, rng=None, dtype=None):
     to_dict = lambda range_: dict(low=range_[0], high=range_[1])
     params = (to_dict(range_) for range_ in ranges) if toolz.isiterable(ranges[0]) else to_dict(ranges)
-    return generate_data_set(testfunction, num_points, rng.uniform, params)
+    return generate_data_set(testfunction, num_points, as_rng(rng).uniform, params, dtype=dtype)
 
 
 def isiterable(x):
@@ -52,9 +65,14 @@ def isiterable(x):
         return False
 
 
-def generate_evenly_spaced_data_set(testfunction, step_sizes, ranges):
+@cached(restore=lambda arrays: test_data(*arrays))
+def generate_evenly_spaced_data_set(testfunction, step_sizes, ranges, dtype=None):
+    return evenly_spaced_grid(testfunction, step_sizes, ranges, dtype=dtype).to_data_set()
 
-    dim = len(inspect.getfullargspec(testfunction).args)
+
+def evenly_spaced_grid(testfunction, step_sizes, ranges, chunk_size=2 ** 16, dtype=None):
+    """Lazy version of `generate_evenly_spaced_data_set`, see `Grid`."""
+    dim = arity(testfunction)
     if len(ranges) == 2 and not isiterable(ranges[0]):
         ranges = repeat(ranges, times=dim)
     else:
@@ -66,28 +84,102 @@ def generate_evenly_spaced_data_set(testfunction, step_sizes, ranges):
     else:
         if dim != len(step_sizes):
             raise ValueError
-    grid = np.meshgrid(
-        *[
-            np.linspace(l, u, (u - l) / step_size + 1, endpoint=True)
-            for (l, u), step_size in zip(ranges, step_sizes)
-        ]
+    axes = [
+        np.linspace(l, u, int(round((u - l) / step_size)) + 1, endpoint=True)
+        for (l, u), step_size in zip(ranges, step_sizes)
+    ]
+    return Grid(testfunction, axes, chunk_size=chunk_size, dtype=dtype)
+
+
+class Grid:
+    """Evenly spaced grid of test points which only stores its axes.
+
+    Points are ordered like the flattened `np.meshgrid` of the axes. Indexing with an integer, a
+    slice or an array of point indices and iterating over the grid evaluate the target only for the
+    requested points, at most `chunk_size` at a time when iterating. Points and targets are
+    computed in float64 and returned as `dtype`.
+    """
+
+    def __init__(self, testfunction, axes, chunk_size=2 ** 16, dtype=None):
+        self.testfunction = testfunction
+        self.axes = [np.asarray(a) for a in axes]
+        self.chunk_size = chunk_size
+        self.dtype = np.dtype(dtype or float)
+        # np.meshgrid with the default "xy" indexing swaps the first two axes
+        self._order = [1, 0, *range(2, len(self.axes))] if len(self.axes) > 1 else [0]
+        self.shape = tuple(len(self.axes[i]) for i in self._order)
+
+    def __len__(self):
+        return int(np.prod(self.shape))
+
+    def points(self, index):
+        """Coordinates of the points with the given flat indices, shape (dim, ...), the transpose of `data`."""
+        index = np.asarray(index)
+        index = np.where(index < 0, index + len(self), index)
+        unraveled = np.unravel_index(index, self.shape)
+        data = np.empty((len(self.axes),) + index.shape)
+        for i, idx in zip(self._order, unraveled):
+            data[i] = self.axes[i][idx]
+        return data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            index = np.arange(*index.indices(len(self)))
+        data = self.points(index)
+        target = self.testfunction(*data)
+        return test_data(data=as_dtype(data, self.dtype).T, target=as_dtype(target, self.dtype))
+
+    def __iter__(self):
+        for start in range(0, len(self), self.chunk_size):
+            yield self[start : start + self.chunk_size]
+
+    def to_data_set(self, data=None, target=None):
+        """Evaluate the whole grid chunk by chunk, optionally into preallocated arrays."""
+        data = np.empty((len(self), len(self.axes)), dtype=self.dtype) if data is None else data
+        target = np.empty(len(self), dtype=self.dtype) if target is None else target
+        start = 0
+        for chunk in self:
+            data[start : start + chunk.target.size] = chunk.data
+            target[start : start + chunk.target.size] = chunk.target
+            start += chunk.target.size
+        return test_data(data=data, target=target)
+
+    def save(self, path):
+        """Evaluate the grid into memory-mapped ``data.npy`` and ``target.npy`` files in directory `path`."""
+        path = pathlib.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        shape = (len(self), len(self.axes))
+        data = np.lib.format.open_memmap(str(path / "data.npy"), mode="w+", dtype=self.dtype, shape=shape)
+        target = np.lib.format.open_memmap(
+            str(path / "target.npy"), mode="w+", dtype=self.dtype, shape=shape[:1]
+        )
+        self.to_data_set(data, target)
+        data.flush()
+        target.flush()
+        return test_data(data=data, target=target)
+
+
+def generators_from_helper(helper, namespace, shift=0, i=()):
+    """Bind `helper` to the test functions ``<module>_func<n>`` of a module namespace.
+
+    Args:
+        helper: generator taking the test function as keyword `func`
+        namespace: globals of the module defining the test functions
+        shift: offset between the number of the test function and the problem
+        i: numbers of the test functions to use, all if empty
+
+    Returns:
+        dict: ``generate_<module><n + shift>`` generators which are not defined in the module itself
+
+    """
+    name = namespace["__name__"].split(".")[-1]
+    prefix = "{}_func".format(name)
+    funcs = sorted(
+        (int(fname[len(prefix) :]), f) for fname, f in namespace.items() if fname.startswith(prefix)
     )
-
-    data = np.array([g.flatten() for g in grid])
-    return test_data(data=data, target=testfunction(*data))
-
-
-def generator_from_helper(helper, shift=0, i=()):
-    caller = getframeinfo(stack()[1][0])  # find current_module by looking up caller in stack
-    name = getmodulename(caller.filename)
-    current_module = [mod for mname, mod in sys.modules.items() if name == mname.split(".")[-1]][0]
-    context = dir(current_module)
-    for f, fname in (
-        (getattr(current_module, func), func) for func in context if "{}_func".format(name) in func
-    ):
-        f_ = partial(helper, func=f)
-        n = int(fname.split("_func")[-1])
-        if n in i or not i:
-            generator_name = "generate_{}{}".format(name, n + shift)
-            if generator_name not in context:
-                setattr(current_module, generator_name, f_)  # register generator function in current_module
+    generators = {}
+    for n, f in funcs:
+        generator_name = "generate_{}{}".format(name, n + shift)
+        if (n in i or not i) and generator_name not in namespace:
+            generators[generator_name] = partial(helper, func=f)
+    return generators
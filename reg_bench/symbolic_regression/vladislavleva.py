@@ -1,7 +1,6 @@
-import sys
-
 import numpy as np
 
+from ..utils import as_rng
 from .util import generate_evenly_spaced_data_set
 from .util import generate_uniform_data_set
 
@@ -21,7 +20,7 @@ def vladislavleva_func3(x, y):
 
 
 def vladislavleva_func4(x, y, z, w, v):
-    return 10.0 / (5 + np.sum((i - 3) ** 2 for i in [x, y, z, w, v]))
+    return 10.0 / (5 + (x - 3) ** 2 + (y - 3) ** 2 + (z - 3) ** 2 + (w - 3) ** 2 + (v - 3) ** 2)
 
 
 def vladislavleva_func5(x, y, z):
@@ -40,55 +39,60 @@ def vladislavleva_func8(x, y):
     return ((x - 3) ** 4 + (y - 3) ** 3 - (y - 3)) / ((y - 2) ** 4 + 10.0)
 
 
-def generate_vladislavleva1(rng=np.random):
-    train = generate_uniform_data_set(vladislavleva_func1, 100, (0.3, 4), rng=rng)
-    test = generate_evenly_spaced_data_set(vladislavleva_func1, 0.1, (-0.2, 4.2))
+def generate_vladislavleva1(rng=None, dtype=None):
+    train = generate_uniform_data_set(vladislavleva_func1, 100, (0.3, 4), rng=rng, dtype=dtype)
+    test = generate_evenly_spaced_data_set(vladislavleva_func1, 0.1, (-0.2, 4.2), dtype=dtype)
     return train, test
 
 
-def generate_vladislavleva2():
-    train = generate_evenly_spaced_data_set(vladislavleva_func2, 0.1, (0.05, 10.0))
-    test = generate_evenly_spaced_data_set(vladislavleva_func2, 0.05, (-0.5, 10.5))
+def generate_vladislavleva2(dtype=None):
+    train = generate_evenly_spaced_data_set(vladislavleva_func2, 0.1, (0.05, 10.0), dtype=dtype)
+    test = generate_evenly_spaced_data_set(vladislavleva_func2, 0.05, (-0.5, 10.5), dtype=dtype)
     return train, test
 
 
-def generate_vladislavleva3():
-    train = generate_evenly_spaced_data_set(vladislavleva_func3, [0.1, 2.0], [(0.05, 10.0), (0.05, 10.05)])
-    test = generate_evenly_spaced_data_set(vladislavleva_func3, [0.05, 0.5], (-0.5, 10.5))
+def generate_vladislavleva3(dtype=None):
+    train = generate_evenly_spaced_data_set(
+        vladislavleva_func3, [0.1, 2.0], [(0.05, 10.0), (0.05, 10.05)], dtype=dtype
+    )
+    test = generate_evenly_spaced_data_set(vladislavleva_func3, [0.05, 0.5], (-0.5, 10.5), dtype=dtype)
     return train, test
 
 
-def generate_vladislavleva4(rng=np.random):
-    train = generate_uniform_data_set(vladislavleva_func4, 1024, (0.05, 6.05), rng=rng)
-    test = generate_uniform_data_set(vladislavleva_func4, 5000, (-0.25, 6.35), rng=rng)
+def generate_vladislavleva4(rng=None, dtype=None):
+    rng = as_rng(rng)
+    train = generate_uniform_data_set(vladislavleva_func4, 1024, (0.05, 6.05), rng=rng, dtype=dtype)
+    test = generate_uniform_data_set(vladislavleva_func4, 5000, (-0.25, 6.35), rng=rng, dtype=dtype)
     return train, test
 
 
-def generate_vladislavleva5(rng=np.random):
-    train = generate_uniform_data_set(vladislavleva_func5, 300, [(0.05, 2), (1, 2), (0.05, 2)], rng=rng)
+def generate_vladislavleva5(rng=None, dtype=None):
+    train = generate_uniform_data_set(
+        vladislavleva_func5, 300, [(0.05, 2), (1, 2), (0.05, 2)], rng=rng, dtype=dtype
+    )
     test = generate_evenly_spaced_data_set(
-        vladislavleva_func5, [0.15, 0.1, 0.15], [(-0.05, 2.1), (0.95, 2.05), (-0.05, 2.1)]
+        vladislavleva_func5, [0.15, 0.1, 0.15], [(-0.05, 2.1), (0.95, 2.05), (-0.05, 2.1)], dtype=dtype
     )
     return train, test
 
 
-def generate_vladislavleva6(rng=np.random):
-    train = generate_uniform_data_set(vladislavleva_func6, 30, (0.1, 5.9), rng=rng)
-    test = generate_evenly_spaced_data_set(vladislavleva_func6, 0.02, (-0.05, 6.05))
+def generate_vladislavleva6(rng=None, dtype=None):
+    train = generate_uniform_data_set(vladislavleva_func6, 30, (0.1, 5.9), rng=rng, dtype=dtype)
+    test = generate_evenly_spaced_data_set(vladislavleva_func6, 0.02, (-0.05, 6.05), dtype=dtype)
     return train, test
 
 
-def generate_vladislavleva7(rng=np.random):
-    train = generate_uniform_data_set(vladislavleva_func7, 300, (0.05, 6.05), rng=rng)
-    test = generate_uniform_data_set(vladislavleva_func7, 1000, (-0.25, 6.35), rng=rng)
+def generate_vladislavleva7(rng=None, dtype=None):
+    rng = as_rng(rng)
+    train = generate_uniform_data_set(vladislavleva_func7, 300, (0.05, 6.05), rng=rng, dtype=dtype)
+    test = generate_uniform_data_set(vladislavleva_func7, 1000, (-0.25, 6.35), rng=rng, dtype=dtype)
     return train, test
 
 
-def generate_vladislavleva8(rng=np.random):
-    train = generate_uniform_data_set(vladislavleva_func8, 50, (0.05, 6.05), rng=rng)
-    test = generate_evenly_spaced_data_set(vladislavleva_func8, 0.02, (-0.25, 6.35))
+def generate_vladislavleva8(rng=None, dtype=None):
+    train = generate_uniform_data_set(vladislavleva_func8, 50, (0.05, 6.05), rng=rng, dtype=dtype)
+    test = generate_evenly_spaced_data_set(vladislavleva_func8, 0.02, (-0.25, 6.35), dtype=dtype)
     return train, test
 
 
-current_module = sys.modules[__name__]
-all_problems = {name: getattr(current_module, name) for name in locals() if "generate_vladislavleva" in name}
+all_problems = {name: f for name, f in globals().items() if "generate_vladislavleva" in name}
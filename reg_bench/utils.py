@@ -1,9 +1,80 @@
+import collections.abc
+
+import numpy as np
+
+
 def make_register(dct):
-    def register(arity, *tags):
+    def register(arity, *tags, **meta):
         def inner(func):
-            dct[func] = {"arity": arity, "tags": tags, "name": func.__name__}
+            dct[func] = {"arity": arity, "tags": tags, "name": func.__name__, **meta}
             return func
 
         return inner
 
     return register
+
+
+def as_dtype(x, dtype=None):
+    """Down-cast a float64 result to `dtype`, None keeps it as is."""
+    return x if dtype is None else np.asarray(x).astype(dtype, copy=False)
+
+
+def as_rng(seed=None):
+    """Random generator from a seed, a `numpy.random.SeedSequence` or an existing generator.
+
+    Generators and legacy `numpy.random.RandomState` instances are returned as they are, so
+    callers share their stream. None returns the global `numpy.random` state, so results stay
+    reproducible with `numpy.random.seed`.
+    """
+    if seed is None:
+        return np.random.mtrand._rand  # the RandomState behind the numpy.random functions
+    if isinstance(seed, np.random.RandomState):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_rngs(seed, n):
+    """`n` statistically independent child generators of a seed or generator.
+
+    Child streams of the same seed are identical across runs, which makes work distributed over
+    threads or processes reproducible independently of the number of workers.
+    """
+    if isinstance(seed, np.random.Generator):
+        seed = seed.integers(2 ** 63, size=4)
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(s) for s in seed.spawn(n)]
+
+
+def make_getattr(module_name, dct):
+    """Module level ``__getattr__`` which resolves missing names from `dct` on first access."""
+
+    def __getattr__(name):
+        try:
+            return dct[name]
+        except KeyError:
+            raise AttributeError("module {!r} has no attribute {!r}".format(module_name, name)) from None
+
+    return __getattr__
+
+
+class LazyDict(collections.abc.Mapping):
+    """Mapping with known keys whose values are built by `factory(key)` on first access."""
+
+    def __init__(self, keys, factory):
+        self._keys = list(keys)
+        self._factory = factory
+        self._values = {}
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            if key not in self._keys:
+                raise KeyError(key)
+            self._values[key] = self._factory(key)
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
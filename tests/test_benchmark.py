@@ -0,0 +1,30 @@
+import json
+
+from reg_bench.benchmark import compare
+from reg_bench.benchmark import main
+from reg_bench.benchmark import run
+
+
+def test_run_and_compare(tmp_path):
+    results = run(["map.henon", "ode.generate_ode_data.*", "sr.generate_koza1*"], repeat=1)
+    assert sorted(results["results"]) == [
+        "map.henon",
+        "ode.generate_ode_data.differentiate",
+        "ode.generate_ode_data.integrate",
+        "ode.generate_ode_data.noise",
+        "sr.generate_koza1",
+    ]
+    assert all(r["time"] > 0 and r["memory"] > 0 for r in results["results"].values())
+    assert compare(results, results) == []
+
+    baseline = json.loads(json.dumps(results))
+    baseline["results"]["map.henon"]["memory"] //= 2
+    baseline["results"]["map.henon"]["time"] /= 10
+    baseline["results"]["map.henon"]["time"] -= 1e-3
+    assert {r[:2] for r in compare(results, baseline)} == {("map.henon", "memory"), ("map.henon", "time")}
+
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps(baseline))
+    argv = ["map.henon", "--repeat", "1", "--baseline", str(path), "--output", str(tmp_path / "new.json")]
+    assert main(argv) == 1
+    assert "map.henon" in json.loads((tmp_path / "new.json").read_text())["results"]
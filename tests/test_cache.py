@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+import reg_bench.cache
+import reg_bench.ode
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(reg_bench.cache, "_cache", None)
+    return reg_bench.cache.enable_cache(tmp_path, max_size=10 ** 4)
+
+
+def test_generate_ode_data_is_cached(cache):
+    args = reg_bench.ode.lorenz, np.ones(3), np.linspace(0, 1, 101)
+    x, dx = reg_bench.ode.generate_ode_data(*args)
+    x_, dx_ = reg_bench.ode.generate_ode_data(*args)
+    assert isinstance(x_, np.memmap) and not x_.flags.writeable
+    np.testing.assert_array_equal(x, x_)
+    np.testing.assert_array_equal(dx, dx_)
+    assert cache.info()["entries"] == 1
+
+
+def test_noisy_data_is_only_cached_with_seed(cache):
+    args = reg_bench.ode.lorenz, np.ones(3), np.linspace(0, 1, 101)
+    reg_bench.ode.generate_ode_data(*args, noise_amplitude=0.1)
+    assert cache.info()["entries"] == 0
+    x, _ = reg_bench.ode.generate_ode_data(*args, noise_amplitude=0.1, seed=0)
+    x_, _ = reg_bench.ode.generate_ode_data(*args, noise_amplitude=0.1, seed=0)
+    np.testing.assert_array_equal(x, x_)
+    assert cache.info()["entries"] == 1
+
+
+def test_lru_eviction(cache):
+    t = np.linspace(0, 1, 101)
+    for r in (10.0, 20.0, 28.0):
+        reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, ode_params=dict(r=r))
+    info = cache.info()
+    assert info["entries"] == 1 and info["size"] <= info["max_size"]
+    cache.clear()
+    assert cache.info()["entries"] == 0
+
+
+def test_memoize():
+    calls = []
+
+    @reg_bench.cache.memoize(maxsize=2)
+    def wrap(x, params=None):
+        calls.append(x)
+        return [x]
+
+    assert wrap(np.arange(3)) is wrap(np.arange(3), params=None)
+    wrap(1.0, dict(a=1))
+    wrap(2.0)
+    wrap(np.arange(3))
+    assert len(calls) == 4
+    assert wrap(lambda: 0) is not wrap(lambda: 0)  # not hashable, not memoized
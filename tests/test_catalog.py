@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from reg_bench import catalog
+from reg_bench import suite
+
+
+@pytest.fixture(scope="module")
+def path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("catalog") / "suite.bin"
+    return catalog.build_catalog(path, n_jobs=1, families=("map", "sr"))
+
+
+def test_lookup_matches_generated_problems(path):
+    index = catalog.read_index(path)
+    assert set(index["problems"]) == {"{}/{}".format(*task) for task in suite.tasks(("map", "sr"))}
+
+    data, target = catalog.lookup("map", "henon", path=path)
+    expected = suite.run_task("map", "henon")
+    np.testing.assert_array_equal(data, expected[0])
+    np.testing.assert_array_equal(target, expected[1])
+    assert isinstance(data, np.memmap)
+
+    train, test = catalog.lookup("sr", "generate_keijzer4", path=path)
+    expected = suite.run_task("sr", "generate_keijzer4")
+    np.testing.assert_array_equal(train.data, expected[0].data)
+    np.testing.assert_array_equal(test.target, expected[1].target)
+
+
+def test_lookup_splits(path):
+    test = catalog.lookup("sr", "generate_korns1", split="test", path=path)
+    expected = suite.run_task("sr", "generate_korns1")[1]
+    np.testing.assert_array_equal(test.data, expected.data)
+    target = catalog.lookup("map", "henon", split="target", path=path)
+    np.testing.assert_array_equal(target, suite.run_task("map", "henon")[1])
+    with pytest.raises(ValueError):
+        catalog.lookup("sr", "generate_korns1", split="data", path=path)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        catalog.read_index(path)
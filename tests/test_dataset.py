@@ -0,0 +1,59 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from reg_bench.dataset import Dataset
+from reg_bench.maps import generate_map_data
+from reg_bench.maps.maps import logistic
+from reg_bench.symbolic_regression.korns import generate_korns1
+
+
+def test_fields_and_unpacking():
+    x = np.arange(20.0).reshape(10, 2)
+    data = Dataset(x, x[:, 0], t=np.arange(10.0), params=dict(a=1.0), exact_target=x[:, 1])
+    features, target = data
+    assert len(data) == 10 and len(list(data)) == 2  # unpacks into two arrays, has ten samples
+    assert features is x and data[1] is data.target and data["t"] is data.t
+    assert data.exact_target is data["exact_target"] and "exact_target" in data and "x0" not in data
+    data.report = {}
+    assert data.keys() == ["data", "target", "t", "params", "exact_target", "report"]
+    with pytest.raises(AttributeError):
+        data.missing
+    with pytest.raises(KeyError):
+        data["x0"]
+
+
+def test_views_and_pickling():
+    data = Dataset(np.arange(20.0).reshape(10, 2), np.arange(10.0), t=np.linspace(0, 1, 10), extra=1)
+    train, test = data.split(0.8)
+    assert len(train) == 8 and len(test) == 2
+    assert np.shares_memory(train.data, data.data) and np.shares_memory(test.t, data.t)
+    window = data.window(2, 8, 2)
+    np.testing.assert_array_equal(window.target, [2.0, 4.0, 6.0])
+    assert window.extra == 1
+
+    restored = pickle.loads(pickle.dumps(data))
+    np.testing.assert_array_equal(restored.data, data.data)
+    assert restored.extra == 1 and restored.t is not None
+
+
+def test_views_keep_per_sample_extras():
+    x = np.arange(10.0)
+    data = Dataset(x[:, None], x, exact_target=-x, report=dict(steps=3))
+    window = data.window(2, 8, 2)
+    np.testing.assert_array_equal(window.exact_target, -window.target)
+    assert window.report is data.report
+    for part in data.split(0.7):
+        np.testing.assert_array_equal(part.exact_target, -part.target)
+        assert np.shares_memory(part.exact_target, data.exact_target)
+
+
+def test_sample_major_generators():
+    train, test = generate_korns1(rng=0)
+    X, y = train.Xy()
+    assert X.shape == (len(y), 5) and np.shares_memory(X, train.data)
+
+    orbit = generate_map_data(logistic, 0.1, 100)
+    X, y = orbit.Xy()
+    assert X.shape == (100, 1) and np.shares_memory(orbit.data, orbit.target)
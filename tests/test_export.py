@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from reg_bench import export
+from reg_bench import suite
+
+
+names = ["lorenz", "henon", "logistic", "generate_keijzer4", "generate_korns1"]
+
+
+@pytest.mark.parametrize("format", export.formats)
+def test_round_trip(tmp_path, format):
+    if format == "hdf5":
+        pytest.importorskip("h5py")
+    if format in ("parquet", "arrow"):
+        pytest.importorskip("pyarrow")
+    manifest = export.export_suite(tmp_path, format=format, names=names, chunk_size=1000)
+    assert manifest["format"] == format
+    assert manifest["problems"]["map/henon"]["arity"] == 2
+    assert manifest["problems"]["ode/lorenz"]["type"] == "ode"
+
+    bunch = export.load(tmp_path, "ode", "lorenz")
+    expected = suite.run_task("ode", "lorenz")
+    for key in ("data", "target", "t", "x0"):
+        np.testing.assert_array_equal(bunch[key], expected[key])
+    assert bunch.params == expected.params
+
+    data, target = export.load(tmp_path, "map", "henon")
+    np.testing.assert_array_equal(np.asarray(data), suite.run_task("map", "henon")[0])
+    np.testing.assert_array_equal(np.asarray(target)[:-1], np.asarray(data)[1:])
+
+    _, target = export.load(tmp_path, "map", "logistic")
+    np.testing.assert_array_equal(target, suite.run_task("map", "logistic")[1])
+    for name in ("generate_keijzer4", "generate_korns1"):
+        for got, expected in zip(export.load(tmp_path, "sr", name), suite.run_task("sr", name)):
+            np.testing.assert_array_equal(np.asarray(got.data), expected.data)
+            np.testing.assert_array_equal(np.asarray(got.target), expected.target)
+
+
+def test_npy_is_memory_mapped(tmp_path):
+    export.export_suite(tmp_path, names=["henon", "generate_keijzer4"])
+    data, target = export.load(tmp_path, "map", "henon")
+    assert isinstance(data.base, np.memmap) and np.shares_memory(data, target)
+    train, _ = export.load(tmp_path, "sr", "generate_keijzer4")
+    assert isinstance(train.data, np.memmap)
+
+
+def test_arrow_is_memory_mapped(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    export.export_suite(tmp_path, format="arrow", names=["lorenz", "generate_keijzer4"])
+    allocated = pa.total_allocated_bytes()
+    lorenz = export.load(tmp_path, "ode", "lorenz")
+    assert pa.total_allocated_bytes() == allocated
+    assert not lorenz.data.flags.owndata and not lorenz.data.flags.writeable
+    np.testing.assert_array_equal(lorenz.data, suite.run_task("ode", "lorenz").data)
+    train, _ = export.load(tmp_path, "sr", "generate_keijzer4")
+    assert train.data.shape[1] == 1 and not train.data.flags.writeable
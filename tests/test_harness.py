@@ -0,0 +1,66 @@
+import csv
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from reg_bench.symbolic_regression.harness import evaluate
+from reg_bench.symbolic_regression.harness import write_leaderboard
+
+
+names = ["generate_koza1", "generate_keijzer4", "generate_korns5"]
+
+
+def mean_model(x, y):
+    return lambda x: np.full(len(x), y.mean())
+
+
+def failing_model(x, y):
+    raise RuntimeError("diverged")
+
+
+def test_evaluate_estimators_and_callables(tmp_path):
+    linear_model = pytest.importorskip("sklearn.linear_model")
+    models = dict(linear=linear_model.LinearRegression(), mean=mean_model, failing=failing_model)
+    results = evaluate(models, names=names, n_jobs=1)
+    assert [(r["model"], r["problem"]) for r in results] == [(m, p) for m in models for p in names]
+    for r in results:
+        if r["model"] == "failing":
+            assert r["error"] == "RuntimeError: diverged" and r["rmse"] is None
+        else:
+            assert r["error"] is None and r["fit_time"] >= 0 and r["memory"] > 0 and np.isfinite(r["rmse"])
+    assert all(r["nrmse"] == pytest.approx(1, abs=0.1) for r in results if r["model"] == "mean")
+
+    board = write_leaderboard(results, tmp_path / "results.csv")
+    assert [row["model"] for row in board] == ["linear", "mean", "failing"]
+    with open(str(tmp_path / "results.csv.leaderboard")) as f:
+        assert [row["model"] for row in csv.DictReader(f)] == ["linear", "mean", "failing"]
+
+
+def test_evaluate_in_processes():
+    serial = evaluate(mean_model, names=names[:2], n_jobs=1)
+    parallel = evaluate(mean_model, names=names[:2], n_jobs=2)
+    assert [r["rmse"] for r in serial] == [r["rmse"] for r in parallel]
+
+
+def test_evaluate_keeps_callers_trace():
+    tracemalloc.start()
+    try:
+        buffer = np.ones(2 ** 22)  # raises the peak of the caller's trace to 32 MiB
+        del buffer
+        results = evaluate(mean_model, names=names[:1], n_jobs=1)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert results[0]["error"] is None
+    if hasattr(tracemalloc, "reset_peak"):
+        assert 0 < results[0]["memory"] < 2 ** 20
+    else:
+        assert results[0]["memory"] is None
+
+
+def test_score_rejects_seed_with_path(tmp_path):
+    from reg_bench.symbolic_regression.harness import score
+
+    with pytest.raises(ValueError):
+        score(mean_model, names[0], path=tmp_path / "sr.bin", seed=1)
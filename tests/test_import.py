@@ -0,0 +1,21 @@
+import subprocess
+import sys
+
+
+# seconds spent in `import reg_bench` on top of importing numpy
+import_time_target = 0.25
+
+script = """
+import sys, time
+import numpy
+t = time.perf_counter()
+import reg_bench, reg_bench.ode, reg_bench.maps, reg_bench.symbolic_regression
+print(time.perf_counter() - t)
+print(",".join(m for m in ("scipy", "sklearn", "derivative", "sympy") if m in sys.modules))
+"""
+
+
+def test_import_time():
+    seconds, heavy = subprocess.check_output([sys.executable, "-c", script]).decode().splitlines()
+    assert not heavy
+    assert float(seconds) < import_time_target
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from reg_bench.lyapunov import kaplan_yorke_dimension
+from reg_bench.lyapunov import map_lyapunov_spectrum
+from reg_bench.lyapunov import ode_lyapunov_spectrum
+from reg_bench.maps.maps import henon
+from reg_bench.maps.maps import logistic
+from reg_bench.ode import lorenz
+
+
+def test_map_spectrum():
+    exponents = map_lyapunov_spectrum(henon, [[0.1, 0.1], [0.0, 0.2]], n_steps=2000)
+    assert exponents.shape == (2, 2)
+    assert np.all(np.diff(exponents, axis=1) <= 0)
+    np.testing.assert_allclose(exponents, [[0.42, -1.62]] * 2, atol=0.02)
+    np.testing.assert_allclose(exponents.sum(axis=1), np.log(0.3), atol=1e-8)  # |det J| = b
+    logistic_exponent = map_lyapunov_spectrum(logistic, 0.1, n_steps=2000, params=dict(r=4.0))
+    np.testing.assert_allclose(logistic_exponent, [[np.log(2)]], atol=0.02)
+
+
+def test_ode_spectrum():
+    exponents = ode_lyapunov_spectrum(lorenz, np.ones(3), t_max=50, dt=0.5, transient=10)
+    assert exponents[0] == pytest.approx(0.9, abs=0.2)
+    assert np.all(np.diff(exponents) <= 0)
+    assert exponents.sum() == pytest.approx(-(10 + 1 + 8.0 / 3.0), abs=0.01)  # trace of the Jacobian
+    assert 2 < kaplan_yorke_dimension(exponents) < 2.2
+    maximal = ode_lyapunov_spectrum(lorenz, np.ones(3), t_max=50, dt=0.5, n_exponents=1, transient=10)
+    assert maximal.shape == (1,)
+
+
+def test_kaplan_yorke_dimension():
+    assert kaplan_yorke_dimension([-1.0, -2.0]) == 0.0
+    assert kaplan_yorke_dimension([0.5, -1.0]) == 1.5
+    assert kaplan_yorke_dimension([0.1, 0.0]) == 2.0
+
+
+def test_spectra_are_memoized():
+    from reg_bench.lyapunov import _map_spectrum
+
+    first = _map_spectrum(henon, np.array([0.1, 0.1]), 100, None, None, 10)
+    assert _map_spectrum(henon, np.array([0.1, 0.1]), 100, None, None, 10) is first
+    assert _map_spectrum(henon, np.array([0.1, 0.1]), 100, dict(a=1.3), None, 10) is not first
+    kwargs = dict(n_steps=100, transient=10)
+    exponents = map_lyapunov_spectrum(henon, [0.1, 0.1], **kwargs)
+    exponents[:] = 0
+    np.testing.assert_array_equal(map_lyapunov_spectrum(henon, [0.1, 0.1], **kwargs), first[0])
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from reg_bench.maps import all_maps
+from reg_bench.maps import generate_map_data
+from reg_bench.maps import generate_map_orbits
+from reg_bench.maps import iterate_map
+from reg_bench.maps.maps import henon
+from reg_bench.maps.maps import logistic
+
+
+@pytest.mark.parametrize("problem", list(all_maps), ids=lambda p: p.__name__)
+def test_orbits_match_scalar_iteration(problem):
+    arity = all_maps[problem]["arity"]
+    x0 = 0.05 * np.arange(1, 4)[:, None] * np.ones((3, arity))
+    # short orbits, the chaotic maps amplify rounding differences of array and scalar arithmetic
+    orbits = generate_map_orbits(problem, x0, 20)
+    assert orbits.shape == (3, 21, arity)
+    f = problem()
+    for x0_, orbit in zip(x0, orbits):
+        state = x0_[0] if arity == 1 else tuple(x0_)
+        for x in orbit[1:]:
+            state = f(state)
+            np.testing.assert_allclose(np.atleast_1d(state), x)
+
+
+def test_generate_map_data_shapes():
+    data, target = generate_map_data(logistic, 0.1, 10)
+    assert data.shape == target.shape == (10,)
+    np.testing.assert_array_equal(data[1:], target[:-1])
+
+
+def test_streaming_and_memory_mapped_orbits(tmp_path):
+    x0 = [[0.1, 0.1], [0.2, 0.0]]
+    orbits = generate_map_orbits(henon, x0, 100)
+    chunks = list(iterate_map(henon, x0, 100, chunk_size=16))
+    assert {c.shape[1] for c in chunks[:-1]} == {16}
+    np.testing.assert_array_equal(np.concatenate(chunks, axis=1), orbits)
+
+    data, target = generate_map_data(henon, x0[0], 100, filename=tmp_path / "henon.npy", chunk_size=16)
+    assert np.shares_memory(data, target)
+    np.testing.assert_array_equal(data, orbits[0, :-1])
+    np.testing.assert_array_equal(np.load(str(tmp_path / "henon.npy"))[0, 1:], target)
+
+
+def test_float32_orbits_are_iterated_in_float64(tmp_path):
+    orbits = generate_map_orbits(logistic, [0.1, 0.2], 200)
+    orbits32 = generate_map_orbits(logistic, [0.1, 0.2], 200, dtype=np.float32, chunk_size=16)
+    assert orbits32.dtype == np.float32
+    np.testing.assert_array_equal(orbits32, orbits.astype(np.float32))
+    data, _ = generate_map_data(logistic, 0.1, 200, filename=tmp_path / "logistic.npy", dtype=np.float32)
+    assert data.dtype == np.float32
+
+
+@pytest.mark.parametrize("problem", list(all_maps), ids=lambda p: p.__name__)
+def test_jit_orbits_match_python(problem):
+    pytest.importorskip("numba")
+    x0 = np.full((2, all_maps[problem]["arity"]), 0.1)
+    # short orbits, numba rounds differently in the last bits and the chaotic maps amplify it
+    orbits = generate_map_orbits(problem, x0, 20)
+    np.testing.assert_allclose(generate_map_orbits(problem, x0, 20, backend="jit"), orbits)
+    chunks = list(iterate_map(problem, x0, 20, chunk_size=8, backend="jit"))
+    np.testing.assert_allclose(np.concatenate(chunks, axis=1), orbits)
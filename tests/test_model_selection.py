@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from reg_bench.dataset import Dataset
+from reg_bench.maps import generate_map_data
+from reg_bench.maps.maps import logistic
+from reg_bench.model_selection import BlockedSplit
+from reg_bench.model_selection import ForwardChaining
+from reg_bench.model_selection import TrajectorySplit
+
+
+@pytest.mark.parametrize("cv", [ForwardChaining(4, gap=5), BlockedSplit(4, gap=3), TrajectorySplit(5)])
+def test_cross_val_score(cv):
+    model_selection = pytest.importorskip("sklearn.model_selection")
+    from sklearn.linear_model import LinearRegression
+
+    x = np.random.RandomState(0).rand(1000, 3)
+    y = x @ np.array([1.0, 2.0, 3.0])
+    scores = model_selection.cross_val_score(LinearRegression(), x, y, cv=cv)
+    assert len(scores) == cv.get_n_splits() and np.allclose(scores, 1)
+
+
+def test_forward_chaining_order_and_gap():
+    folds = list(ForwardChaining(3, gap=2, max_train_size=20).split(np.empty(100)))
+    assert len(folds) == 3
+    for train, test in folds:
+        assert train[-1] + 2 < test[0] and len(train) <= 20 and len(test) == 25
+        assert train.base is not None and test.base is train.base
+    assert folds[-1][1][-1] == 99
+
+
+def test_blocked_split_views_of_map_orbit():
+    data = generate_map_data(logistic, 0.3, 1000)
+    for train, test in BlockedSplit(4, test_fraction=0.25, gap=10).views(data):
+        assert len(train) + 10 + len(test) == 250 and len(test) == 62
+        assert np.shares_memory(train.data, data.data) and np.shares_memory(test.target, data.target)
+
+
+def test_trajectory_split_groups():
+    groups = np.repeat([3, 1, 2, 0], 5)
+    folds = list(TrajectorySplit(2).split(np.empty(20), groups=groups))
+    np.testing.assert_array_equal(folds[0][1], np.arange(10))
+    np.testing.assert_array_equal(folds[1][0], np.arange(10))
+
+    ensemble = np.random.rand(6, 50, 3)
+    for train, test in TrajectorySplit(3).views(ensemble):
+        assert len(train) == 4 and len(test) == 2 and np.shares_memory(test.data, ensemble)
+    t = np.linspace(0, 1, 50)
+    for train, test in TrajectorySplit(3).views(Dataset(ensemble, None, t=t)):
+        assert train.t is t and test.t is t
+    stacked = Dataset(np.random.rand(30, 3), np.random.rand(30), t=np.arange(30.0))
+    train, test = list(TrajectorySplit(3).views(stacked))[1]
+    np.testing.assert_array_equal(train.t, np.r_[0:10, 20:30])
+    stacked.exact_target = -stacked.target
+    groups = np.repeat([0, 1, 2], [5, 15, 10])
+    train, test = list(TrajectorySplit(3).views(stacked, groups=groups))[1]
+    np.testing.assert_array_equal(test.t, np.arange(5.0, 20.0))
+    np.testing.assert_array_equal(train.t, np.r_[0:5, 20:30])
+    np.testing.assert_array_equal(train.exact_target, -train.target)
+    with pytest.raises(ValueError):
+        list(TrajectorySplit(2).split(np.empty(4), groups=[0, 1, 0, 1]))
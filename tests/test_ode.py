@@ -0,0 +1,282 @@
+import numpy as np
+import pytest
+
+import reg_bench.ode
+
+
+t = np.linspace(0, 1, 101)
+
+
+@pytest.mark.parametrize("problem", [reg_bench.ode.lorenz, reg_bench.ode.yeast_glycolysis()])
+def test_ensemble_matches_single_runs(problem):
+    arity = 3 if problem is reg_bench.ode.lorenz else 7
+    x0 = np.linspace(0.5, 1.5, 4)[:, None] * np.ones((4, arity))
+    x, dx = reg_bench.ode.generate_ode_ensemble(problem, x0, t)
+    assert x.shape == dx.shape == (4, len(t), arity)
+    for x0_, x_ in zip(x0, x):
+        np.testing.assert_allclose(
+            x_, reg_bench.ode.generate_ode_data(problem, x0_, t)[0], rtol=1e-3, atol=1e-4
+        )
+
+
+def test_single_trajectory_batches_are_integrated_like_single_runs():
+    yeast = reg_bench.ode.yeast_glycolysis()
+    x0 = yeast.initial_conditions(n=3, rng=0)
+    x, _ = reg_bench.ode.generate_ode_ensemble(yeast, x0, t)  # declares batch_size=1
+    lorenz, _ = reg_bench.ode.generate_ode_ensemble(
+        reg_bench.ode.lorenz, np.ones(3), t, ode_params=dict(r=[10.0, 28.0]), batch_size=1
+    )
+    for x0_, x_ in zip(x0, x):
+        np.testing.assert_array_equal(x_, reg_bench.ode.generate_ode_data(yeast, x0_, t)[0])
+    single, _ = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, ode_params=dict(r=28.0))
+    np.testing.assert_array_equal(lorenz[1], single)
+
+
+def test_ensemble_parameter_sets():
+    params = [dict(r=r) for r in (10.0, 28.0)]
+    x, _ = reg_bench.ode.generate_ode_ensemble(reg_bench.ode.lorenz, np.ones(3), t, ode_params=params)
+    for p, x_ in zip(params, x):
+        single, _ = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, ode_params=p)
+        np.testing.assert_allclose(x_, single, rtol=1e-3, atol=1e-4)
+
+
+@pytest.mark.parametrize("backend", ["symbolic", "pyodesys"])
+def test_symbolic_backends_match_python(backend):
+    problem = reg_bench.ode.yeast_glycolysis()
+    x0 = [1.0, 1.0, 0.1, 0.2, 0.1, 1.0, 0.05]
+    x = reg_bench.ode.integrate_ode(problem, x0, t, backend=backend)
+    np.testing.assert_allclose(x, reg_bench.ode.integrate_ode(problem, x0, t), rtol=1e-4, atol=1e-6)
+
+
+def test_analytic_jacobian():
+    from reg_bench.ode.symbolic import compile_ode
+
+    rhs, jac = compile_ode(reg_bench.ode.lorenz, 3)
+    y, eps = np.array([1.0, 2.0, 3.0]), 1e-6
+    fd = np.array([(np.subtract(rhs(y + eps * e, 0), rhs(y - eps * e, 0))) / (2 * eps) for e in np.eye(3)]).T
+    np.testing.assert_allclose(jac(y, 0), fd, rtol=1e-6)
+
+
+def test_compiled_callables_are_shared_between_instances():
+    from reg_bench.ode.symbolic import compile_ode
+
+    yeast = reg_bench.ode.yeast_glycolysis
+    assert compile_ode(yeast(), 7) is compile_ode(yeast(), 7)
+    assert compile_ode(yeast(), 7, dict(k1=50.0)) is not compile_ode(yeast(), 7)
+
+
+def test_windowed_generation(tmp_path):
+    from reg_bench.ode.integrate import estimate_derivative
+
+    t = np.linspace(0, 5, 1001)
+    kwargs = dict(noise_amplitude=0.01, seed=0, diff_params=dict(kind="holoborodko", M=3))
+    windows = dict(window=100, overlap=8)
+    chunks = list(reg_bench.ode.iterate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, **windows, **kwargs))
+    assert len(chunks) == 11
+    x = np.concatenate([c[1] for c in chunks])
+    dx = np.concatenate([c[2] for c in chunks])
+    np.testing.assert_allclose(dx, estimate_derivative(t, x, kwargs["diff_params"]))
+    full, _ = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, **kwargs)
+    np.testing.assert_allclose(x, full, atol=1e-4)
+
+    x_, dx_ = reg_bench.ode.generate_ode_memmap(
+        tmp_path, reg_bench.ode.lorenz, np.ones(3), t, **windows, **kwargs
+    )
+    np.testing.assert_array_equal(x_, x)
+    np.testing.assert_array_equal(dx_, dx)
+
+
+def test_windowed_generation_edge_cases(monkeypatch):
+    from reg_bench.ode import windowed
+
+    assert list(windowed.iterate_ode_data(reg_bench.ode.lorenz, np.ones(3), np.array([]))) == []
+
+    left_sizes = []
+    differentiate = windowed._differentiate
+
+    def record(x, left, *args):
+        left_sizes.append(len(left[0]))
+        return differentiate(x, left, *args)
+
+    monkeypatch.setattr(windowed, "_differentiate", record)
+    t = np.linspace(0, 1, 500)
+    chunks = list(windowed.iterate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, window=100, overlap=0))
+    assert sum(len(c[0]) for c in chunks) == len(t) and left_sizes == [0] * len(chunks)
+
+
+def test_float32_output(tmp_path):
+    t = np.linspace(0, 5, 501)
+    x, dx = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t)
+    x32, dx32 = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, dtype=np.float32)
+    assert x32.dtype == dx32.dtype == np.float32
+    np.testing.assert_array_equal(x32, x.astype(np.float32))
+    np.testing.assert_array_equal(dx32, dx.astype(np.float32))
+
+    x_, _ = reg_bench.ode.generate_ode_memmap(tmp_path, reg_bench.ode.lorenz, np.ones(3), t, dtype="float32")
+    assert x_.dtype == np.float32
+    assert reg_bench.ode.load_lorenz(dtype=np.float32).data.dtype == np.float32
+
+
+def test_noise_and_initial_conditions_from_generator():
+    t = np.linspace(0, 1, 101)
+    kwargs = dict(noise_amplitude=0.1, diff_params=dict(kind="finitediff", k=1))
+    rng = np.random.default_rng(1)
+    x, _ = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, seed=rng, **kwargs)
+    x_, _ = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, seed=1, **kwargs)
+    np.testing.assert_array_equal(x, x_)
+
+    yeast = reg_bench.ode.yeast_glycolysis()
+    x0 = yeast.initial_conditions(n=16, rng=0)
+    assert x0.shape == (16, 7) and np.all(x0 >= 0)
+    np.testing.assert_array_equal(x0, yeast.initial_conditions(n=16, rng=np.random.default_rng(0)))
+    assert yeast.initial_conditions(rng=0).shape == (7,)
+    low, high = np.transpose(yeast.range)
+    x0 = yeast.initial_conditions(False, 0)
+    assert x0.shape == (7,) and np.all((low <= x0) & (x0 <= high))
+
+
+def test_instrumentation_report():
+    reports = []
+    t = np.linspace(0, 1, 101)
+    x, dx = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, callback=reports.append)
+    (report,) = reports
+    assert set(report["stages"]) == {"integrate", "noise", "differentiate"}
+    assert report["solver"]["steps"] > 0 and report["solver"]["rhs_evaluations"] >= report["solver"]["steps"]
+    assert report["arrays"]["x"] == dict(shape=x.shape, dtype=x.dtype.str, nbytes=x.nbytes)
+
+    received = []
+    bunch = reg_bench.ode.load_van_der_pol(instrument=received.append)
+    assert received == [bunch.report] and bunch.report["problem"] == "van_der_pol"
+
+
+@pytest.mark.parametrize("solver", ["RK45", "DOP853", "Radau", "BDF", "LSODA", "rk4"])
+def test_solvers_match_odeint(solver):
+    from reg_bench.ode.integrate import integrate_ode
+
+    reference = integrate_ode(reg_bench.ode.lorenz, np.ones(3), t)
+    params = dict(substeps=4) if solver == "rk4" else None
+    x, stats = integrate_ode(
+        reg_bench.ode.lorenz, np.ones(3), t, solver=solver, solver_params=params, full_output=True
+    )
+    np.testing.assert_allclose(x, reference, rtol=1e-5, atol=1e-6)
+    assert stats["methods"] == [solver] and stats["rhs_evaluations"] > 0
+    ensemble, _ = reg_bench.ode.generate_ode_ensemble(
+        reg_bench.ode.lorenz, [[1.0, 1.0, 1.0], [0.5, 1.0, 1.5]], t, solver=solver, solver_params=params
+    )
+    np.testing.assert_allclose(ensemble[0], reference, rtol=1e-5, atol=1e-6)
+
+
+def test_declared_default_solver(monkeypatch):
+    from reg_bench.ode.integrate import integrate_ode
+    from reg_bench.ode.simple_ode import all_ode
+
+    meta = dict(all_ode[reg_bench.ode.lorenz], solver="rk4", solver_params=dict(substeps=2))
+    monkeypatch.setitem(all_ode, reg_bench.ode.lorenz, meta)
+    _, stats = integrate_ode(reg_bench.ode.lorenz, np.ones(3), t, full_output=True)
+    assert stats["methods"] == ["rk4"] and stats["steps"] == 2 * (len(t) - 1)
+    reports = []
+    reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, callback=reports.append)
+    assert reports[0]["solver"]["methods"] == ["rk4"]
+
+    monkeypatch.setattr(reg_bench.ode.yeast_glycolysis, "solver", "BDF")
+    yeast = reg_bench.ode.yeast_glycolysis()
+    _, stats = integrate_ode(yeast, yeast.initial_conditions(rng=0), t, full_output=True)
+    assert stats["methods"] == ["BDF"]
+    with pytest.raises(ValueError):
+        integrate_ode(yeast, yeast.initial_conditions(rng=0), t, solver="euler")
+
+
+def test_exact_derivative_targets():
+    kwargs = dict(diff_params=dict(kind="finitediff", k=1))
+    x, dx = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, target="exact", **kwargs)
+    f = reg_bench.ode.lorenz()
+    np.testing.assert_allclose(dx, [f(x_, t_) for x_, t_ in zip(x, t)])
+    _, dx_estimate = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, **kwargs)
+    assert np.linalg.norm(dx_estimate - dx) < 0.05 * np.linalg.norm(dx)
+
+    noisy, dx_noisy, dx_exact = reg_bench.ode.generate_ode_data(
+        reg_bench.ode.lorenz, np.ones(3), t, noise_amplitude=0.1, seed=0, target="both", **kwargs
+    )
+    assert not np.allclose(noisy, x)
+    np.testing.assert_array_equal(dx_exact, dx)
+    assert not np.allclose(dx_noisy, dx)
+    bunch = reg_bench.ode.load_lorenz(target="both")
+    assert bunch.exact_target.shape == bunch.target.shape
+
+
+def test_multiple_derivative_configs():
+    from reg_bench.ode.derivatives import estimate_derivative
+    from reg_bench.ode.derivatives import estimate_derivatives
+
+    configs = [
+        dict(kind="finitediff"),
+        dict(kind="holoborodko", M=3),
+        dict(kind="cubic_spline"),
+        dict(kind="cubic_spline", order=2),
+        dict(kind="fft"),
+        dict(kind="savitzky_golay", window_length=7, polyorder=2),
+    ]
+    x, dx = reg_bench.ode.generate_ode_data(
+        reg_bench.ode.lorenz, np.ones(3), t, noise_amplitude=0.01, seed=0, diff_params=configs
+    )
+    assert list(dx) == [
+        "finitediff",
+        "holoborodko(M=3)",
+        "cubic_spline",
+        "cubic_spline(order=2)",
+        "fft",
+        "savitzky_golay(polyorder=2, window_length=7)",
+    ]
+    for config, dx_ in zip(configs, dx.values()):
+        np.testing.assert_allclose(dx_, estimate_derivative(t, x, config), rtol=1e-9, atol=1e-9)
+    with pytest.raises(ValueError, match="finitediff"):
+        estimate_derivatives(t, x, [dict(kind="finitediff"), {}])
+
+
+@pytest.mark.parametrize("problem", list(reg_bench.ode.simple_ode.all_ode), ids=lambda p: p.__name__)
+def test_jit_backend_matches_python(problem):
+    pytest.importorskip("numba")
+    x0 = np.linspace(0.5, 1.5, reg_bench.ode.simple_ode.all_ode[problem]["arity"])
+    x = reg_bench.ode.integrate.integrate_ode(problem, x0, t)
+    np.testing.assert_allclose(reg_bench.ode.integrate.integrate_ode(problem, x0, t, backend="jit"), x)
+
+
+@pytest.mark.parametrize("solver", ["RK45", "Radau"])
+def test_jit_backend_with_solve_ivp(solver):
+    pytest.importorskip("numba")
+    x0 = np.ones(3)
+    x = reg_bench.ode.integrate.integrate_ode(reg_bench.ode.lorenz, x0, t, solver=solver)
+    np.testing.assert_allclose(
+        reg_bench.ode.integrate.integrate_ode(reg_bench.ode.lorenz, x0, t, backend="jit", solver=solver),
+        x,
+        rtol=1e-6,
+    )
+
+
+def test_jit_falls_back_to_python(monkeypatch):
+    from reg_bench import jit
+
+    monkeypatch.setattr(jit, "_numba", lambda: None)
+    monkeypatch.setattr(jit, "_kernel", jit._kernel.__wrapped__)
+    problem = reg_bench.ode.yeast_glycolysis()
+    x0 = problem.initial_conditions()
+    x = reg_bench.ode.integrate.integrate_ode(problem, x0, t, backend="jit")
+    np.testing.assert_array_equal(x, reg_bench.ode.integrate.integrate_ode(problem, x0, t))
+
+
+def test_parameter_sweep():
+    from reg_bench.ode.sweep import select
+
+    grid = dict(r=[10.0, 28.0], b=[2.0, 8.0 / 3.0, 3.0])
+    sweep = reg_bench.ode.generate_ode_sweep(reg_bench.ode.lorenz, np.ones(3), t, grid)
+    assert sweep.data.shape == sweep.target.shape == (2, 3, len(t), 3)
+    assert sweep.dims == ("r", "b", "t", "state")
+    params = dict(r=28.0, b=3.0)
+    single, _ = reg_bench.ode.generate_ode_data(reg_bench.ode.lorenz, np.ones(3), t, ode_params=params)
+    np.testing.assert_allclose(select(sweep, r=28.0, b=3.0)[0], single, rtol=1e-3, atol=1e-4)
+    assert select(sweep, b=2.0)[0].shape == (2, len(t), 3)
+
+    batched = reg_bench.ode.generate_ode_sweep(reg_bench.ode.lorenz, np.ones(3), t, grid, batch_size=4)
+    np.testing.assert_allclose(batched.data, sweep.data, rtol=1e-3, atol=1e-4)
+    with pytest.raises(KeyError):
+        select(sweep, s=10.0)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from reg_bench.suite import generate_suite
+
+
+names = ["generate_koza2", "generate_korns1", "generate_keijzer5", "henon", "lorenz"]
+
+
+def test_results_do_not_depend_on_workers():
+    serial = {name: result for _, name, result in generate_suite(seed=42, n_jobs=1, names=names)}
+    parallel = {name: result for _, name, result in generate_suite(seed=42, n_jobs=2, names=names)}
+    assert sorted(serial) == sorted(parallel) == sorted(names)
+    for name in ["generate_koza2", "generate_korns1", "generate_keijzer5"]:
+        for a, b in zip(serial[name], parallel[name]):
+            np.testing.assert_array_equal(a.data, b.data)
+            np.testing.assert_array_equal(a.target, b.target)
+    np.testing.assert_array_equal(serial["henon"][0], parallel["henon"][0])
+    np.testing.assert_array_equal(serial["lorenz"].data, parallel["lorenz"].data)
+
+
+def test_seed_changes_random_problems():
+    a = dict((name, result) for _, name, result in generate_suite(seed=0, n_jobs=1, names=names[:1]))
+    b = dict((name, result) for _, name, result in generate_suite(seed=1, n_jobs=1, names=names[:1]))
+    assert not np.array_equal(a[names[0]][0].data, b[names[0]][0].data)
+
+
+def test_spawned_streams_are_reproducible_in_threads():
+    import concurrent.futures
+
+    from reg_bench.symbolic_regression.korns import generate_korns1
+    from reg_bench.utils import spawn_rngs
+
+    def run(rngs, n_jobs):
+        with concurrent.futures.ThreadPoolExecutor(n_jobs) as executor:
+            return list(executor.map(lambda rng: generate_korns1(rng=rng)[0].data, rngs))
+
+    serial = run(spawn_rngs(0, 4), 1)
+    threaded = run(spawn_rngs(0, 4), 4)
+    for a, b in zip(serial, threaded):
+        np.testing.assert_array_equal(a, b)
+    assert not np.array_equal(serial[0], serial[1])
@@ -0,0 +1,105 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from reg_bench.symbolic_regression.util import arity
+from reg_bench.symbolic_regression.util import evenly_spaced_grid
+from reg_bench.symbolic_regression.vladislavleva import vladislavleva_func5
+
+
+def test_grid_matches_meshgrid(tmp_path):
+    steps, ranges = [0.15, 0.1, 0.15], [(-0.05, 2.1), (0.95, 2.05), (-0.05, 2.1)]
+    grid = evenly_spaced_grid(vladislavleva_func5, steps, ranges, chunk_size=100)
+    data = np.array([g.flatten() for g in np.meshgrid(*grid.axes)])
+    assert [len(a) for a in grid.axes] == [15, 12, 15] and len(grid) == data.shape[1]
+
+    full = grid.to_data_set()
+    np.testing.assert_array_equal(full.data, data.T)
+    np.testing.assert_array_equal(full.target, vladislavleva_func5(*data))
+    np.testing.assert_array_equal(np.concatenate([chunk.target for chunk in grid]), full.target)
+    np.testing.assert_array_equal(grid[-10:].data, data[:, -10:].T)
+    np.testing.assert_array_equal(grid[[3, 1000]].target, full.target[[3, 1000]])
+    np.testing.assert_array_equal(grid.save(tmp_path).target, full.target)
+
+
+def _test_functions():
+    from reg_bench.symbolic_regression import keijzer, korns, koza, nguyen, pagie, vladislavleva
+
+    modules = [keijzer, korns, koza, nguyen, pagie, vladislavleva]
+    return [(name, f) for m in modules for name, f in sorted(vars(m).items()) if "_func" in name]
+
+
+def _reference_keijzer_func7(x):
+    return np.array([sum(1.0 / i for i in range(1, int(n))) for n in x])
+
+
+def _reference_poly(x, i):
+    return sum(x ** j for j in range(1, i + 1))
+
+
+def _reference_vladislavleva_func4(x, y, z, w, v):
+    return 10.0 / (5 + sum((i - 3) ** 2 for i in [x, y, z, w, v]))
+
+
+references = {
+    "keijzer_func7": _reference_keijzer_func7,
+    "koza_func1": partial(_reference_poly, i=4),
+    "nguyen_func1": partial(_reference_poly, i=3),
+    "nguyen_func3": partial(_reference_poly, i=5),
+    "nguyen_func4": partial(_reference_poly, i=6),
+    "vladislavleva_func4": _reference_vladislavleva_func4,
+}
+
+
+@pytest.mark.parametrize("name, func", _test_functions(), ids=[name for name, _ in _test_functions()])
+def test_test_functions_are_vectorized(name, func):
+    data = np.random.RandomState(0).uniform(0.1, 5.0, size=(arity(func), 2000))
+    with np.errstate(all="ignore"):
+        vectorized = func(*data)
+        elementwise = np.array([func(*point) for point in data.T])
+        if name in references:
+            np.testing.assert_allclose(vectorized, references[name](*data), rtol=1e-12)
+    # array and scalar sin/cos may differ by an ulp of large arguments, e.g. cos(7.23 * x0 ** 3)
+    np.testing.assert_allclose(vectorized, elementwise, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_float32_data_sets():
+    from reg_bench.symbolic_regression.keijzer import generate_keijzer13
+
+    train, test = generate_keijzer13(rng=np.random.RandomState(0))
+    train32, test32 = generate_keijzer13(rng=np.random.RandomState(0), dtype=np.float32)
+    for data, data32 in ((train, train32), (test, test32)):
+        assert data32.data.dtype == data32.target.dtype == np.float32
+        np.testing.assert_array_equal(data32.target, data.target.astype(np.float32))
+
+
+@pytest.mark.parametrize(
+    "module, name",
+    [
+        ("koza", "generate_koza1"),
+        ("korns", "generate_korns1"),
+        ("nguyen", "generate_nguyen1"),
+        ("nguyen", "generate_nguyen7"),
+        ("nguyen", "generate_nguyen9"),
+        ("keijzer", "generate_keijzer5"),
+        ("vladislavleva", "generate_vladislavleva4"),
+    ],
+)
+def test_seeded_train_and_test_differ(module, name):
+    import importlib
+
+    generator = getattr(importlib.import_module("reg_bench.symbolic_regression." + module), name)
+    train, test = generator(rng=0)
+    assert len(train.data) != len(test.data) or not np.array_equal(train.data, test.data)
+    again, _ = generator(rng=0)
+    np.testing.assert_array_equal(again.data, train.data)
+
+
+def test_unseeded_data_sets_use_the_global_state():
+    from reg_bench.symbolic_regression.koza import generate_koza1
+
+    np.random.seed(0)
+    train, _ = generate_koza1()
+    np.random.seed(0)
+    np.testing.assert_array_equal(generate_koza1()[0].data, train.data)